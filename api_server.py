@@ -4,23 +4,48 @@ FastAPI Server for N8N Workflow Documentation
 High-performance API with sub-100ms response times.
 """
 
-from fastapi import FastAPI, HTTPException, Query, BackgroundTasks, Request, File, UploadFile, Form
+from fastapi import FastAPI, HTTPException, Query, BackgroundTasks, Request, Response, File, UploadFile, Form
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import HTMLResponse, FileResponse, JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from pydantic import BaseModel, field_validator
 from typing import Optional, List, Dict, Any, Tuple
+import heapq
 import json
+import logging
+import logging.handlers
+import mimetypes
 import os
+import queue
 import re
+import stat as stat_module
+import string
+import sys
 import urllib.parse
+import zlib
 from pathlib import Path
 import uvicorn
 import time
-from collections import defaultdict
-
-from workflow_db import WorkflowDatabase
+import asyncio
+import threading
+import functools
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from workflow_db import WorkflowDatabase, generate_mermaid_diagram
+
+# Structured logging: handlers only enqueue records on the request path; a
+# background listener thread owns the actual stream I/O, so requests never
+# serialize on stdout/stderr locks
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_log_stream = logging.StreamHandler(sys.stderr)
+_log_stream.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(message)s"))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_stream)
+_log_listener.start()
+
+logger = logging.getLogger("api")
+logger.setLevel(logging.INFO)
+logger.addHandler(logging.handlers.QueueHandler(_log_queue))
 
 # Load environment variables from .env file
 try:
@@ -29,25 +54,94 @@ try:
 except ImportError:
     pass  # python-dotenv not installed, skip
 
-# SendGrid email integration
+# Background tasks live in tasks.py; the Celery path is used when a broker
+# is configured, otherwise FastAPI BackgroundTasks handles dispatch in-process
+from tasks import (
+    CELERY_AVAILABLE,
+    index_all_task,
+    index_one_task,
+    send_purchase_notification_email,
+    send_purchase_notification_email_task,
+)
+
+CELERY_ENABLED = CELERY_AVAILABLE and bool(os.environ.get("CELERY_BROKER_URL"))
+
+# uvloop event loop (faster libuv-based replacement for the stdlib asyncio loop)
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False  # Not installed or unsupported platform (e.g. Windows)
+
+# orjson JSON codec (Rust-backed, much faster than stdlib json)
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Redis client for rate limiting shared across workers (optional)
 try:
-    from sendgrid import SendGridAPIClient
-    from sendgrid.helpers.mail import Mail, Email, To, Content
-    SENDGRID_AVAILABLE = True
+    import redis.asyncio as aioredis
+    from redis.exceptions import NoScriptError
+    REDIS_AVAILABLE = True
 except ImportError:
-    SENDGRID_AVAILABLE = False
-    print("[WARNING] SendGrid not installed. Install with: pip install sendgrid")
+    REDIS_AVAILABLE = False
+
+
+def read_json_file(path) -> Any:
+    """Read and parse a JSON file with the fastest available codec."""
+    with open(path, "rb") as f:
+        raw = f.read()
+    return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+
+
+def parse_json_bytes(raw) -> Any:
+    """Parse JSON from bytes or str with the fastest available codec.
+
+    orjson accepts bytes directly, skipping the UTF-8 decode pass stdlib
+    json would need; its decode errors subclass json.JSONDecodeError so
+    callers can keep a single except clause.
+    """
+    return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+
+
+def write_json_file(path, obj) -> None:
+    """Serialize an object to an indented UTF-8 JSON file."""
+    if ORJSON_AVAILABLE:
+        with open(path, "wb") as f:
+            f.write(
+                orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            )
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(obj, f, indent=2, ensure_ascii=False)
 
 # Initialize FastAPI app
 app = FastAPI(
     title="N8N Workflow Documentation API",
     description="Fast API for browsing and searching workflow documentation",
     version="2.0.0",
+    default_response_class=ORJSONResponse if ORJSON_AVAILABLE else JSONResponse,
 )
 
-# Security: Rate limiting storage
-rate_limit_storage = defaultdict(list)
+# Security: Rate limiting storage (token bucket per client IP)
+# Each entry is (tokens, last_refill) so admission is O(1) per request,
+# instead of rebuilding a list of timestamps on every call.
+# Buckets are sharded by IP hash so concurrent requests only contend on
+# their own shard's lock instead of serializing on one shared dict.
 MAX_REQUESTS_PER_MINUTE = 60  # Configure as needed
+RATE_LIMIT_CAPACITY = float(MAX_REQUESTS_PER_MINUTE)  # Burst size
+RATE_LIMIT_REFILL_RATE = MAX_REQUESTS_PER_MINUTE / 60.0  # Tokens per second
+RATE_LIMIT_SHARDS = 16  # Power of two so we can mask instead of modulo
+RATE_LIMIT_IDLE_SECONDS = 120  # Evict buckets idle for longer than this
+rate_limit_shards: List[Dict[str, Tuple[float, float]]] = [
+    {} for _ in range(RATE_LIMIT_SHARDS)
+]
+rate_limit_locks: List[threading.Lock] = [
+    threading.Lock() for _ in range(RATE_LIMIT_SHARDS)
+]
 
 # Add middleware for performance
 app.add_middleware(GZipMiddleware, minimum_size=1000)
@@ -74,23 +168,420 @@ app.add_middleware(
 # Initialize database
 db = WorkflowDatabase()
 
+# In-memory view of context/search_categories.json keyed by filename. The
+# delete path mutates this dict and flushes to disk with a debounce, so a
+# delete no longer rewrites the whole mapping file inline.
+SEARCH_CATEGORIES_FILE = Path("context/search_categories.json")
+CATEGORY_FLUSH_DELAY = 5.0  # Seconds to coalesce mapping writes
+CATEGORY_FLUSH_MAX_DELAY = 30.0  # Hard cap under sustained mutation churn
+CATEGORY_MAPPINGS: Dict[str, Dict] = {}
+_category_flush_task: Optional[asyncio.Task] = None
+_category_flush_deadline: Optional[float] = None
+
+# Module-level references to fire-and-forget background tasks: the event loop
+# only keeps weak references, so without these the tasks can be garbage
+# collected mid-flight
+_rate_limit_evict_task: Optional[asyncio.Task] = None
+_index_supervisor_task: Optional[asyncio.Task] = None
+
+
+def load_category_mappings() -> None:
+    """Load the search-categories file into the in-memory mapping."""
+    global CATEGORY_MAPPINGS
+    mappings: Dict[str, Dict] = {}
+    if SEARCH_CATEGORIES_FILE.exists():
+        try:
+            for item in read_json_file(SEARCH_CATEGORIES_FILE):
+                filename = item.get("filename")
+                if filename:
+                    mappings[filename] = item
+        except Exception as e:
+            logger.warning("Could not load category mappings: %s", e)
+    CATEGORY_MAPPINGS = mappings
+
+
+def flush_category_mappings() -> None:
+    """Write the in-memory category mappings back to disk atomically."""
+    SEARCH_CATEGORIES_FILE.parent.mkdir(exist_ok=True)
+    tmp_path = SEARCH_CATEGORIES_FILE.with_suffix(".json.tmp")
+    write_json_file(tmp_path, list(CATEGORY_MAPPINGS.values()))
+    os.replace(tmp_path, SEARCH_CATEGORIES_FILE)
+
+
+def schedule_category_flush() -> None:
+    """Debounce disk writes: restart the delay timer on every mutation.
+
+    A sustained stream of mutations restarts the timer each time, so the
+    first unflushed mutation also arms a hard deadline; the flush never
+    trails the mutation that armed it by more than CATEGORY_FLUSH_MAX_DELAY.
+    """
+    global _category_flush_task, _category_flush_deadline
+
+    now = time.monotonic()
+    if _category_flush_deadline is None:
+        _category_flush_deadline = now + CATEGORY_FLUSH_MAX_DELAY
+    delay = min(CATEGORY_FLUSH_DELAY, _category_flush_deadline - now)
+
+    async def _flush_later():
+        global _category_flush_deadline
+        await asyncio.sleep(max(delay, 0.0))
+        _category_flush_deadline = None
+        await asyncio.to_thread(flush_category_mappings)
+
+    if _category_flush_task and not _category_flush_task.done():
+        _category_flush_task.cancel()
+    _category_flush_task = asyncio.create_task(_flush_later())
+
+
+# Stats change only on mutations, so cache them briefly: the lru_cache key is
+# the current 30-second time bucket, and mutation paths call cache_clear()
+STATS_CACHE_TTL = 30.0  # Seconds
+
+
+@functools.lru_cache(maxsize=1)
+def _stats_for_bucket(time_bucket: int) -> Dict[str, Any]:
+    return db.get_stats()
+
+
+def get_cached_stats() -> Dict[str, Any]:
+    """Get database stats, cached for up to STATS_CACHE_TTL seconds."""
+    return _stats_for_bucket(int(time.time() / STATS_CACHE_TTL))
+
+
+# Workflows directory resolved once; per-request resolve() calls are wasted work
+WORKFLOWS_PATH = Path("workflows").resolve()
+WORKFLOWS_ROOT = str(WORKFLOWS_PATH)  # For prefix containment checks
+
+
+def is_inside_workflows(path: Path) -> bool:
+    """True if path (after symlink resolution) lives under workflows/."""
+    return os.path.realpath(path).startswith(WORKFLOWS_ROOT + os.sep)
+
+# filename -> Path index so endpoints do a dict lookup instead of scanning
+# every service subdirectory on each request. Rebuilt on startup and after
+# any mutation (upload, delete, reindex).
+FILE_INDEX: Dict[str, Path] = {}
+
+# Service subdirectories cached alongside the index; used for direct stat
+# probes when a filename is not (yet) in the index
+WORKFLOW_SUBDIRS: List[Path] = []
+
+
+def refresh_file_index() -> None:
+    """Rebuild the filename -> Path index from the workflows directory."""
+    index: Dict[str, Path] = {}
+    subdirs: List[Path] = []
+    if WORKFLOWS_PATH.exists():
+        for subdir in WORKFLOWS_PATH.iterdir():
+            if subdir.is_dir():
+                subdirs.append(subdir)
+                for path in subdir.iterdir():
+                    # Containment is checked once here so per-request lookups
+                    # don't have to resolve symlinks again
+                    if path.is_file() and is_inside_workflows(path):
+                        index[path.name] = path
+    global FILE_INDEX, WORKFLOW_SUBDIRS
+    FILE_INDEX = index
+    WORKFLOW_SUBDIRS = subdirs
+
+
+# Parsed-JSON cache for the small context/ files, invalidated by mtime so
+# rare regenerations are picked up without a restart
+_json_file_cache: Dict[str, Tuple[int, Any]] = {}
+
+
+def load_json_cached(path: str) -> Any:
+    """Parse a JSON file, re-reading it only when its mtime changes."""
+    mtime_ns = os.stat(path).st_mtime_ns
+    cached = _json_file_cache.get(path)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+    data = read_json_file(path)
+    _json_file_cache[path] = (mtime_ns, data)
+    return data
+
+
+@functools.lru_cache(maxsize=1)
+def _filename_to_category(path: str, mtime_ns: int) -> Dict[str, str]:
+    """Derive the filename -> category dict once per file version."""
+    mappings: Dict[str, str] = {}
+    for item in load_json_cached(path):
+        filename = item.get("filename")
+        if filename:
+            mappings[filename] = item.get("category") or "Uncategorized"
+    return mappings
+
+
+def get_filename_to_category(path: Path) -> Dict[str, str]:
+    """Cached filename -> category mapping for a search-categories file."""
+    return _filename_to_category(str(path), os.stat(path).st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=1)
+def _unique_categories(path: str, mtime_ns: int) -> List[str]:
+    """Sorted unique category names, derived once per file version."""
+    unique = {
+        item.get("category") or "Uncategorized" for item in load_json_cached(path)
+    }
+    return sorted(unique)
+
+
+def get_unique_categories(path: Path) -> List[str]:
+    """Cached sorted category list for a search-categories file."""
+    return _unique_categories(str(path), os.stat(path).st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=1)
+def _category_mappings_bytes(path: str, mtime_ns: int) -> bytes:
+    """Serialized /api/category-mappings body, built once per file version.
+
+    Caching the bytes (not just the dict) means steady-state requests skip
+    serialization entirely; the per-request cost is one stat plus a cache
+    lookup. A changed mtime produces a new key, so invalidation is free.
+    """
+    payload = {"mappings": _filename_to_category(path, mtime_ns)}
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode("utf-8")
+
+
+def get_category_mappings_bytes(path: Path) -> bytes:
+    """Cached serialized category-mappings response for path."""
+    return _category_mappings_bytes(str(path), os.stat(path).st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=512)
+def load_workflow_json(path: str, mtime_ns: int) -> Dict:
+    """Parse a workflow file, cached by (path, mtime).
+
+    A rewritten file bumps its mtime and therefore misses the cache, so
+    invalidation is automatic; the LRU bound keeps memory in check.
+    """
+    return read_json_file(path)
+
+
+@functools.lru_cache(maxsize=512)
+def diagram_for_workflow(path: str, mtime_ns: int) -> str:
+    """Generate (and cache) the Mermaid diagram for a workflow file."""
+    data = load_workflow_json(path, mtime_ns)
+    return generate_mermaid_diagram(data.get("nodes", []), data.get("connections", {}))
+
+
+def find_workflow_file(filename: str) -> Optional[Path]:
+    """Look up a workflow file by name, verifying it is inside workflows/."""
+    matching_file = FILE_INDEX.get(filename)
+    if matching_file is not None and matching_file.is_file():
+        # Containment was already verified when the index entry was created,
+        # so the hot path needs no further path resolution
+        return matching_file
+
+    # Fall back to one stat() per known subdirectory; this catches files
+    # added since the index was built without re-walking the tree
+    for subdir in WORKFLOW_SUBDIRS:
+        candidate = subdir / filename
+        if candidate.is_file():
+            # Unindexed candidate: verify containment before trusting it
+            if not is_inside_workflows(candidate):
+                logger.warning(
+                    "Security: Blocked access to file outside workflows: %s", candidate
+                )
+                return None
+            FILE_INDEX[filename] = candidate
+            return candidate
+    return None
+
 
 # Security: Helper function for rate limiting
 def check_rate_limit(client_ip: str) -> bool:
-    """Check if client has exceeded rate limit."""
+    """Check if client has exceeded rate limit (sharded token bucket)."""
     current_time = time.time()
-    # Clean old entries
-    rate_limit_storage[client_ip] = [
-        timestamp
-        for timestamp in rate_limit_storage[client_ip]
-        if current_time - timestamp < 60
-    ]
-    # Check rate limit
-    if len(rate_limit_storage[client_ip]) >= MAX_REQUESTS_PER_MINUTE:
-        return False
-    # Add current request
-    rate_limit_storage[client_ip].append(current_time)
-    return True
+    shard_index = hash(client_ip) & (RATE_LIMIT_SHARDS - 1)
+    shard = rate_limit_shards[shard_index]
+    with rate_limit_locks[shard_index]:
+        tokens, last_refill = shard.get(client_ip, (RATE_LIMIT_CAPACITY, current_time))
+        # Refill tokens for the time elapsed since the last request
+        tokens = min(
+            RATE_LIMIT_CAPACITY,
+            tokens + (current_time - last_refill) * RATE_LIMIT_REFILL_RATE,
+        )
+        if tokens < 1.0:
+            shard[client_ip] = (tokens, current_time)
+            return False
+        shard[client_ip] = (tokens - 1.0, current_time)
+        return True
+
+
+async def evict_stale_rate_limit_entries():
+    """Periodically drop rate-limit buckets for IPs that have gone idle.
+
+    Runs as a single maintainer task so worker threads never contend over
+    cleanup; memory stays bounded by the set of recently active clients.
+    """
+    while True:
+        await asyncio.sleep(RATE_LIMIT_IDLE_SECONDS)
+        cutoff = time.time() - RATE_LIMIT_IDLE_SECONDS
+        for shard, lock in zip(rate_limit_shards, rate_limit_locks):
+            with lock:
+                stale = [ip for ip, (_, last) in shard.items() if last < cutoff]
+                for ip in stale:
+                    del shard[ip]
+
+
+# Token-bucket math executed server-side in Redis, so one atomic EVALSHA
+# round-trip both refills and admits; all workers share the same buckets
+RATE_LIMIT_LUA = """
+local tokens, last_refill
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'last_refill')
+tokens = tonumber(bucket[1])
+last_refill = tonumber(bucket[2])
+if tokens == nil then
+    tokens = capacity
+    last_refill = now
+end
+tokens = math.min(capacity, tokens + (now - last_refill) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HMSET', KEYS[1], 'tokens', tokens, 'last_refill', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) * 2)
+return {allowed, math.floor(tokens), math.ceil((capacity - tokens) / rate)}
+"""
+
+
+class RedisRateLimiter:
+    """Token-bucket rate limiter shared across workers via Redis.
+
+    The script is loaded once (SCRIPT LOAD) and then invoked by SHA per
+    check, keeping the per-request cost to a single round-trip.
+    """
+
+    def __init__(self, url: str, rate: float, capacity: float):
+        self._redis = aioredis.from_url(url)
+        self._rate = rate
+        self._capacity = capacity
+        self._script_sha: Optional[str] = None
+
+    async def load_script(self) -> None:
+        self._script_sha = await self._redis.script_load(RATE_LIMIT_LUA)
+
+    async def check(self, client_ip: str) -> Tuple[bool, int, int]:
+        """Return (allowed, remaining tokens, seconds until full refill)."""
+        if self._script_sha is None:
+            await self.load_script()
+        try:
+            allowed, remaining, reset = await self._evalsha(client_ip)
+        except NoScriptError:
+            # A Redis restart or SCRIPT FLUSH drops loaded scripts;
+            # re-load and retry once so the shared limiter recovers
+            # instead of degrading to per-worker buckets for good
+            await self.load_script()
+            allowed, remaining, reset = await self._evalsha(client_ip)
+        return bool(allowed), int(remaining), int(reset)
+
+    async def _evalsha(self, client_ip: str):
+        return await self._redis.evalsha(
+            self._script_sha,
+            1,
+            f"ratelimit:{client_ip}",
+            self._rate,
+            self._capacity,
+            time.time(),
+        )
+
+
+# Shared limiter is opt-in via REDIS_URL; without it (or without the redis
+# package) the in-process sharded bucket above applies per worker
+RATE_LIMIT_RPS = float(os.environ.get("RATE_LIMIT_RPS", RATE_LIMIT_REFILL_RATE))
+RATE_LIMIT_BURST = float(os.environ.get("RATE_LIMIT_BURST", RATE_LIMIT_CAPACITY))
+redis_limiter: Optional[RedisRateLimiter] = None
+if REDIS_AVAILABLE and os.environ.get("REDIS_URL"):
+    redis_limiter = RedisRateLimiter(
+        os.environ["REDIS_URL"], RATE_LIMIT_RPS, RATE_LIMIT_BURST
+    )
+
+
+# Ephemeral deny cache: once Redis rejects an IP we remember the reset time
+# locally, so follow-up requests in the same burst are denied with a dict
+# lookup instead of another Redis round-trip
+rate_limit_denied: Dict[str, float] = {}
+_denied_heap: List[Tuple[float, str]] = []
+
+
+def _sweep_denied(now: float) -> None:
+    """Drop expired deny entries so the cache stays bounded."""
+    while _denied_heap and _denied_heap[0][0] <= now:
+        expiry, ip = heapq.heappop(_denied_heap)
+        if rate_limit_denied.get(ip) == expiry:
+            del rate_limit_denied[ip]
+
+
+async def enforce_rate_limit(client_ip: str) -> None:
+    """Raise 429 when the client has exceeded the rate limit.
+
+    Prefers the Redis bucket (correct across workers); falls back to the
+    in-process bucket when Redis is unconfigured or unreachable.
+    """
+    if redis_limiter is not None:
+        now = time.monotonic()
+        denied_until = rate_limit_denied.get(client_ip, 0.0)
+        if denied_until > now:
+            raise HTTPException(
+                status_code=429,
+                detail="Rate limit exceeded. Please try again later.",
+                headers={"Retry-After": str(int(denied_until - now) + 1)},
+            )
+        _sweep_denied(now)
+        try:
+            allowed, remaining, reset = await redis_limiter.check(client_ip)
+        except Exception as e:
+            logger.warning("Redis rate limiter unavailable, using local bucket: %s", e)
+        else:
+            if not allowed:
+                expiry = now + reset
+                rate_limit_denied[client_ip] = expiry
+                heapq.heappush(_denied_heap, (expiry, client_ip))
+                raise HTTPException(
+                    status_code=429,
+                    detail="Rate limit exceeded. Please try again later.",
+                    headers={
+                        "X-RateLimit-Remaining": str(remaining),
+                        "X-RateLimit-Reset": str(reset),
+                        "Retry-After": str(reset),
+                    },
+                )
+            return
+    if not check_rate_limit(client_ip):
+        raise HTTPException(
+            status_code=429, detail="Rate limit exceeded. Please try again later."
+        )
+
+
+# Security: Allowed filename shape. The whitelist of [A-Za-z0-9_-] plus a
+# .json suffix already excludes every traversal/injection pattern (.. / \
+# null bytes, drive letters, shell metachars, ...), so no separate
+# dangerous-pattern scan is needed.
+SAFE_FILENAME_RE = re.compile(r"^[A-Za-z0-9_\-]+\.json\Z")
+
+# Filename sanitation: one translate() pass replaces unsafe characters with
+# "_", avoiding repeated regex substitutions on the upload path. The safe
+# set matches SAFE_FILENAME_RE (no "."); every other codepoint — including
+# non-ASCII — falls through __missing__, so nothing passes untouched.
+FILENAME_SAFE_CHARS = set(string.ascii_letters + string.digits + "_-")
+
+
+class _FilenameTranslateTable(dict):
+    def __missing__(self, codepoint: int) -> str:
+        return "_"
+
+
+FILENAME_TRANSLATE_TABLE = _FilenameTranslateTable(
+    {ord(c): c for c in FILENAME_SAFE_CHARS}
+)
 
 
 # Security: Helper function to validate and sanitize filenames
@@ -104,69 +595,59 @@ def validate_filename(filename: str) -> bool:
     for _ in range(3):  # Decode up to 3 times to catch nested encodings
         try:
             decoded = urllib.parse.unquote(decoded, errors="strict")
-        except:
+        except Exception:
             return False  # Invalid encoding
 
-    # Check for path traversal patterns
-    dangerous_patterns = [
-        "..",  # Parent directory
-        "..\\",  # Windows parent directory
-        "../",  # Unix parent directory
-        "\\",  # Backslash (Windows path separator)
-        "/",  # Forward slash (Unix path separator)
-        "\x00",  # Null byte
-        "\n",
-        "\r",  # Newlines
-        "~",  # Home directory
-        ":",  # Drive letter or stream (Windows)
-        "|",
-        "<",
-        ">",  # Shell redirection
-        "*",
-        "?",  # Wildcards
-        "$",  # Variable expansion
-        ";",
-        "&",  # Command separators
-    ]
-
-    for pattern in dangerous_patterns:
-        if pattern in decoded:
-            return False
-
-    # Check for absolute paths
-    if decoded.startswith("/") or decoded.startswith("\\"):
-        return False
-
-    # Check for Windows drive letters
-    if len(decoded) >= 2 and decoded[1] == ":":
-        return False
-
     # Only allow alphanumeric, dash, underscore, and .json extension
-    if not re.match(r"^[a-zA-Z0-9_\-]+\.json$", decoded):
-        return False
-
-    # Additional check: filename should end with .json
-    if not decoded.endswith(".json"):
-        return False
-
-    return True
+    return bool(SAFE_FILENAME_RE.match(decoded))
 
 
 # Startup function to verify database
 @app.on_event("startup")
 async def startup_event():
     """Verify database connectivity on startup."""
+    # Bound the default executor backing asyncio.to_thread so a burst of
+    # blocking offloads queues instead of spawning unbounded threads
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=32))
+    global _rate_limit_evict_task, _index_supervisor_task
+    _rate_limit_evict_task = asyncio.create_task(evict_stale_rate_limit_entries())
+    if not CELERY_ENABLED:
+        _index_supervisor_task = asyncio.create_task(index_supervisor())
+    global redis_limiter
+    if redis_limiter is not None:
+        try:
+            await redis_limiter.load_script()
+            logger.info("Redis rate limiter enabled (shared across workers)")
+        except Exception as e:
+            logger.warning("Redis unavailable, using per-worker rate limiter: %s", e)
+            redis_limiter = None
+    refresh_file_index()
+    load_category_mappings()
+    # Warm the serialized category-mappings response so even the first
+    # request is served from cache
+    if SEARCH_CATEGORIES_FILE.exists():
+        await asyncio.to_thread(get_category_mappings_bytes, SEARCH_CATEGORIES_FILE)
+    logger.info("Workflow file index built: %d files", len(FILE_INDEX))
     try:
         stats = db.get_stats()
         if stats["total"] == 0:
-            print("[WARNING] No workflows found in database. Run indexing first.")
+            logger.warning("No workflows found in database. Run indexing first.")
         else:
-            print(f"[OK] Database connected: {stats['total']} workflows indexed")
+            logger.info("Database connected: %s workflows indexed", stats["total"])
     except Exception as e:
-        print(f"[ERROR] Database connection failed: {e}")
+        logger.error("Database connection failed: %s", e)
         raise
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Flush any pending category-mapping write before the worker exits."""
+    if _category_flush_task and not _category_flush_task.done():
+        _category_flush_task.cancel()
+        await asyncio.to_thread(flush_category_mappings)
+
+
 # Response models
 class WorkflowSummary(BaseModel):
     id: Optional[int] = None
@@ -253,13 +734,16 @@ async def health_check():
 async def get_stats():
     """Get workflow database statistics."""
     try:
-        stats = db.get_stats()
+        stats = await asyncio.to_thread(get_cached_stats)
         return StatsResponse(**stats)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching stats: {str(e)}")
 
 
-@app.get("/api/workflows", response_model=SearchResponse)
+# Note: no response_model here — rows are returned as plain dicts so Pydantic
+# validation doesn't run per row on the hottest endpoint (shape matches
+# SearchResponse)
+@app.get("/api/workflows")
 async def search_workflows(
     q: str = Query("", description="Search query"),
     trigger: str = Query("all", description="Filter by trigger type"),
@@ -273,7 +757,10 @@ async def search_workflows(
     try:
         offset = (page - 1) * per_page
 
-        workflows, total = db.search_workflows(
+        # SQLite access is synchronous; run it in a worker thread so the
+        # event loop stays free for other connections
+        workflows, total = await asyncio.to_thread(
+            db.search_workflows,
             query=q,
             trigger_filter=trigger,
             complexity_filter=complexity,
@@ -283,57 +770,49 @@ async def search_workflows(
             offset=offset,
         )
 
-        # Convert to Pydantic models with error handling
+        # Shape rows as plain summary dicts (no per-row model validation)
         workflow_summaries = []
         for workflow in workflows:
-            try:
-                # Get category - handle None, empty string, or missing
-                category_value = workflow.get("category")
-                if not category_value or (isinstance(category_value, str) and category_value.strip() == ""):
-                    category_value = "Uncategorized"
-                # Ensure it's a string
-                category_value = str(category_value) if category_value else "Uncategorized"
-                
-                # Remove extra fields that aren't in the model
-                clean_workflow = {
+            # Get category - handle None, empty string, or missing
+            category_value = workflow.get("category")
+            if not category_value or (isinstance(category_value, str) and category_value.strip() == ""):
+                category_value = "Uncategorized"
+
+            # Keep only the summary fields
+            workflow_summaries.append(
+                {
                     "id": workflow.get("id"),
                     "filename": workflow.get("filename", ""),
                     "name": workflow.get("name", ""),
-                    "active": workflow.get("active", False),
+                    "active": bool(workflow.get("active", False)),
                     "description": workflow.get("description", ""),
                     "trigger_type": workflow.get("trigger_type", "Manual"),
                     "complexity": workflow.get("complexity", "low"),
                     "node_count": workflow.get("node_count", 0),
                     "integrations": workflow.get("integrations", []),
                     "tags": workflow.get("tags", []),
-                    "category": category_value,
+                    "category": str(category_value),
                     "created_at": workflow.get("created_at"),
                     "updated_at": workflow.get("updated_at"),
                 }
-                workflow_summaries.append(WorkflowSummary(**clean_workflow))
-            except Exception as e:
-                print(
-                    f"Error converting workflow {workflow.get('filename', 'unknown')}: {e}"
-                )
-                # Continue with other workflows instead of failing completely
-                continue
+            )
 
         pages = (total + per_page - 1) // per_page  # Ceiling division
 
-        return SearchResponse(
-            workflows=workflow_summaries,
-            total=total,
-            page=page,
-            per_page=per_page,
-            pages=pages,
-            query=q,
-            filters={
+        return {
+            "workflows": workflow_summaries,
+            "total": total,
+            "page": page,
+            "per_page": per_page,
+            "pages": pages,
+            "query": q,
+            "filters": {
                 "trigger": trigger,
                 "complexity": complexity,
                 "category": category,
                 "active_only": active_only,
             },
-        )
+        }
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Error searching workflows: {str(e)}"
@@ -346,54 +825,34 @@ async def get_workflow_detail(filename: str, request: Request):
     try:
         # Security: Validate filename to prevent path traversal
         if not validate_filename(filename):
-            print(f"Security: Blocked path traversal attempt for filename: {filename}")
+            logger.debug("Security: Blocked path traversal attempt for filename: %s", filename)
             raise HTTPException(status_code=400, detail="Invalid filename format")
 
         # Security: Rate limiting
         client_ip = request.client.host if request.client else "unknown"
-        if not check_rate_limit(client_ip):
-            raise HTTPException(
-                status_code=429, detail="Rate limit exceeded. Please try again later."
-            )
+        await enforce_rate_limit(client_ip)
 
-        # Get workflow metadata from database
-        workflows, _ = db.search_workflows(f'filename:"{filename}"', limit=1)
-        if not workflows:
+        # Get workflow metadata from database (direct unique-index lookup)
+        workflow_meta = await asyncio.to_thread(db.get_workflow_by_filename, filename)
+        if not workflow_meta:
             raise HTTPException(
                 status_code=404, detail="Workflow not found in database"
             )
 
-        workflow_meta = workflows[0]
-
         # Load raw JSON from file with security checks
-        workflows_path = Path("workflows").resolve()
-
-        # Find the file safely
-        matching_file = None
-        for subdir in workflows_path.iterdir():
-            if subdir.is_dir():
-                target_file = subdir / filename
-                if target_file.exists() and target_file.is_file():
-                    # Verify the file is actually within workflows directory
-                    try:
-                        target_file.resolve().relative_to(workflows_path)
-                        matching_file = target_file
-                        break
-                    except ValueError:
-                        print(
-                            f"Security: Blocked access to file outside workflows: {target_file}"
-                        )
-                        continue
-
+        matching_file = find_workflow_file(filename)
         if not matching_file:
-            print(f"Warning: File {filename} not found in workflows directory")
+            logger.warning("File %s not found in workflows directory", filename)
             raise HTTPException(
                 status_code=404,
                 detail=f"Workflow file '{filename}' not found on filesystem",
             )
 
-        with open(matching_file, "r", encoding="utf-8") as f:
-            raw_json = json.load(f)
+        # Run the (cold-cache) file read + parse in a worker thread so the
+        # event loop keeps serving other requests during disk I/O
+        raw_json = await asyncio.to_thread(
+            load_workflow_json, str(matching_file), matching_file.stat().st_mtime_ns
+        )
 
         return {"metadata": workflow_meta, "raw_json": raw_json}
     except HTTPException:
@@ -408,60 +867,28 @@ async def download_workflow(filename: str, request: Request):
     try:
         # Security: Validate filename to prevent path traversal
         if not validate_filename(filename):
-            print(f"Security: Blocked path traversal attempt for filename: {filename}")
+            logger.debug("Security: Blocked path traversal attempt for filename: %s", filename)
             raise HTTPException(status_code=400, detail="Invalid filename format")
 
         # Security: Rate limiting
         client_ip = request.client.host if request.client else "unknown"
-        if not check_rate_limit(client_ip):
-            raise HTTPException(
-                status_code=429, detail="Rate limit exceeded. Please try again later."
-            )
+        await enforce_rate_limit(client_ip)
 
         # Only search within the workflows directory
-        workflows_path = Path("workflows").resolve()  # Get absolute path
-
-        # Find the file safely
-        json_files = []
-        for subdir in workflows_path.iterdir():
-            if subdir.is_dir():
-                target_file = subdir / filename
-                if target_file.exists() and target_file.is_file():
-                    # Verify the file is actually within workflows directory (defense in depth)
-                    try:
-                        target_file.resolve().relative_to(workflows_path)
-                        json_files.append(target_file)
-                    except ValueError:
-                        # File is outside workflows directory
-                        print(
-                            f"Security: Blocked access to file outside workflows: {target_file}"
-                        )
-                        continue
-
-        if not json_files:
-            print(f"File {filename} not found in workflows directory")
+        file_path = find_workflow_file(filename)
+        if not file_path:
+            logger.warning("File %s not found in workflows directory", filename)
             raise HTTPException(
                 status_code=404, detail=f"Workflow file '{filename}' not found"
             )
 
-        file_path = json_files[0]
-
-        # Final security check: Ensure file is within workflows directory
-        try:
-            file_path.resolve().relative_to(workflows_path)
-        except ValueError:
-            print(
-                f"Security: Blocked final attempt to access file outside workflows: {file_path}"
-            )
-            raise HTTPException(status_code=403, detail="Access denied")
-
         return FileResponse(
             str(file_path), media_type="application/json", filename=filename
         )
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error downloading workflow {filename}: {str(e)}")
+        logger.error("Error downloading workflow %s: %s", filename, e)
         raise HTTPException(
             status_code=500, detail=f"Error downloading workflow: {str(e)}"
         )
@@ -473,40 +900,25 @@ async def delete_workflow(filename: str, request: Request):
     try:
         # Security: Validate filename to prevent path traversal
         if not validate_filename(filename):
-            print(f"Security: Blocked path traversal attempt for filename: {filename}")
+            logger.debug("Security: Blocked path traversal attempt for filename: %s", filename)
             raise HTTPException(status_code=400, detail="Invalid filename format")
 
         # Security: Rate limiting
         client_ip = request.client.host if request.client else "unknown"
-        if not check_rate_limit(client_ip):
-            raise HTTPException(
-                status_code=429, detail="Rate limit exceeded. Please try again later."
-            )
+        await enforce_rate_limit(client_ip)
 
-        # Check if workflow exists in database
-        workflows, _ = db.search_workflows(f'filename:"{filename}"', limit=1)
-        if not workflows:
+        # Check if workflow exists in database (direct unique-index lookup)
+        if not await asyncio.to_thread(db.get_workflow_by_filename, filename):
             raise HTTPException(
                 status_code=404, detail="Workflow not found in database"
             )
 
         # Find and delete the file
-        workflows_path = Path("workflows").resolve()
-        matching_file = None
-        
-        for subdir in workflows_path.iterdir():
-            if subdir.is_dir():
-                target_file = subdir / filename
-                if target_file.exists() and target_file.is_file():
-                    try:
-                        target_file.resolve().relative_to(workflows_path)
-                        matching_file = target_file
-                        break
-                    except ValueError:
-                        continue
+        matching_file = find_workflow_file(filename)
 
         # Delete from database
-        deleted_from_db = db.delete_workflow(filename)
+        deleted_from_db = await asyncio.to_thread(db.delete_workflow, filename)
+        _stats_for_bucket.cache_clear()
         if not deleted_from_db:
             raise HTTPException(
                 status_code=500, detail="Failed to delete workflow from database"
@@ -517,25 +929,18 @@ async def delete_workflow(filename: str, request: Request):
         if matching_file:
             try:
                 matching_file.unlink()
+                FILE_INDEX.pop(filename, None)
                 file_deleted = True
-                print(f"[OK] Deleted workflow file: {matching_file}")
+                logger.info("Deleted workflow file: %s", matching_file)
             except Exception as e:
-                print(f"⚠️  Warning: Could not delete file {matching_file}: {e}")
+                logger.warning("Could not delete file %s: %s", matching_file, e)
 
-        # Remove from category mappings if exists
+        # Remove from category mappings (in-memory; disk write is debounced)
         try:
-            search_categories_file = Path("context/search_categories.json")
-            if search_categories_file.exists():
-                with open(search_categories_file, "r", encoding="utf-8") as f:
-                    categories = json.load(f)
-                
-                # Remove entry for this filename
-                categories = [item for item in categories if item.get("filename") != filename]
-                
-                with open(search_categories_file, "w", encoding="utf-8") as f:
-                    json.dump(categories, f, indent=2, ensure_ascii=False)
+            if CATEGORY_MAPPINGS.pop(filename, None) is not None:
+                schedule_category_flush()
         except Exception as e:
-            print(f"⚠️  Warning: Could not update category mappings: {e}")
+            logger.warning("Could not update category mappings: %s", e)
 
         return {
             "message": f"Workflow '{filename}' deleted successfully",
@@ -558,140 +963,137 @@ async def get_workflow_diagram(filename: str, request: Request):
     try:
         # Security: Validate filename to prevent path traversal
         if not validate_filename(filename):
-            print(f"Security: Blocked path traversal attempt for filename: {filename}")
+            logger.debug("Security: Blocked path traversal attempt for filename: %s", filename)
             raise HTTPException(status_code=400, detail="Invalid filename format")
 
         # Security: Rate limiting
         client_ip = request.client.host if request.client else "unknown"
-        if not check_rate_limit(client_ip):
-            raise HTTPException(
-                status_code=429, detail="Rate limit exceeded. Please try again later."
-            )
+        await enforce_rate_limit(client_ip)
 
-        # Only search within the workflows directory
-        workflows_path = Path("workflows").resolve()
-
-        # Find the file safely
-        matching_file = None
-        for subdir in workflows_path.iterdir():
-            if subdir.is_dir():
-                target_file = subdir / filename
-                if target_file.exists() and target_file.is_file():
-                    # Verify the file is actually within workflows directory
-                    try:
-                        target_file.resolve().relative_to(workflows_path)
-                        matching_file = target_file
-                        break
-                    except ValueError:
-                        print(
-                            f"Security: Blocked access to file outside workflows: {target_file}"
-                        )
-                        continue
+        # Serve the diagram precomputed at index time when available
+        diagram = await asyncio.to_thread(db.get_diagram, filename)
+        if diagram:
+            return {"diagram": diagram}
 
+        # Fall back to on-demand generation (legacy rows / unindexed files)
+        matching_file = find_workflow_file(filename)
         if not matching_file:
-            print(f"Warning: File {filename} not found in workflows directory")
+            logger.warning("File %s not found in workflows directory", filename)
             raise HTTPException(
                 status_code=404,
                 detail=f"Workflow file '{filename}' not found on filesystem",
             )
 
-        with open(matching_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        nodes = data.get("nodes", [])
-        connections = data.get("connections", {})
-
-        # Generate Mermaid diagram
-        diagram = generate_mermaid_diagram(nodes, connections)
+        # Cold-cache reads and diagram generation run off the event loop
+        diagram = await asyncio.to_thread(
+            diagram_for_workflow, str(matching_file), matching_file.stat().st_mtime_ns
+        )
 
         return {"diagram": diagram}
     except HTTPException:
         raise
     except json.JSONDecodeError as e:
-        print(f"Error parsing JSON in {filename}: {str(e)}")
+        logger.error("Error parsing JSON in %s: %s", filename, e)
         raise HTTPException(
             status_code=400, detail=f"Invalid JSON in workflow file: {str(e)}"
         )
     except Exception as e:
-        print(f"Error generating diagram for {filename}: {str(e)}")
+        logger.error("Error generating diagram for %s: %s", filename, e)
         raise HTTPException(
             status_code=500, detail=f"Error generating diagram: {str(e)}"
         )
 
 
+# Service -> directory mapping for uploaded workflows. Compiled into a single
+# alternation regex (group name == directory) so each node is classified in
+# one C-level scan instead of ~35 Python-level substring checks.
+WORKFLOW_DIR_MAPPINGS = {
+    "telegram": "Telegram",
+    "discord": "Discord",
+    "slack": "Slack",
+    "gmail": "Gmail",
+    "googlesheets": "Googlesheets",
+    "googledrive": "Googledrive",
+    "webhook": "Webhook",
+    "http": "Http",
+    "schedule": "Schedule",
+    "cron": "Cron",
+    "postgres": "Postgres",
+    "mysql": "Mysqltool",
+    "mongodb": "Mongodbtool",
+    "airtable": "Airtable",
+    "github": "Github",
+    "gitlab": "Gitlab",
+    "jira": "Jira",
+    "openai": "Openai",
+    "notion": "Notion",
+    "shopify": "Shopify",
+    "stripe": "Stripe",
+    "twitter": "Twitter",
+    "linkedin": "Linkedin",
+    "facebook": "Facebook",
+    "instagram": "Instagram",
+    "whatsapp": "Whatsapp",
+    "trello": "Trello",
+    "asana": "Asana",
+    "mondaycom": "Mondaycom",
+    "dropbox": "Dropbox",
+    "onedrive": "Microsoftonedrive",
+    "outlook": "Microsoftoutlook",
+    "calendly": "Calendly",
+    "typeform": "Typeform",
+    "youtube": "Youtube",
+    "wordpress": "Wordpress",
+    "woocommerce": "Woocommerce",
+}
+WORKFLOW_DIR_SERVICE_RE = re.compile(
+    "|".join(
+        f"(?P<{directory}>{key})" for key, directory in WORKFLOW_DIR_MAPPINGS.items()
+    )
+)
+# Mapping order is priority order: when several services appear in one node
+# (e.g. a Slack node whose type mentions "http"), the earliest entry wins,
+# not the earliest substring
+_WORKFLOW_DIR_PRIORITY = {
+    directory: rank for rank, directory in enumerate(WORKFLOW_DIR_MAPPINGS.values())
+}
+
+
 def determine_workflow_directory(workflow_data: Dict) -> str:
     """Determine the appropriate subdirectory for a workflow based on its content."""
     nodes = workflow_data.get("nodes", [])
     if not nodes:
         return "Manual"  # Default directory
-    
-    # Get the first non-utility node to determine category
-    service_mappings = {
-        "telegram": "Telegram",
-        "discord": "Discord",
-        "slack": "Slack",
-        "gmail": "Gmail",
-        "googlesheets": "Googlesheets",
-        "googledrive": "Googledrive",
-        "webhook": "Webhook",
-        "http": "Http",
-        "schedule": "Schedule",
-        "cron": "Cron",
-        "postgres": "Postgres",
-        "mysql": "Mysqltool",
-        "mongodb": "Mongodbtool",
-        "airtable": "Airtable",
-        "github": "Github",
-        "gitlab": "Gitlab",
-        "jira": "Jira",
-        "openai": "Openai",
-        "notion": "Notion",
-        "shopify": "Shopify",
-        "stripe": "Stripe",
-        "twitter": "Twitter",
-        "linkedin": "Linkedin",
-        "facebook": "Facebook",
-        "instagram": "Instagram",
-        "whatsapp": "Whatsapp",
-        "trello": "Trello",
-        "asana": "Asana",
-        "mondaycom": "Mondaycom",
-        "dropbox": "Dropbox",
-        "onedrive": "Microsoftonedrive",
-        "outlook": "Microsoftoutlook",
-        "calendly": "Calendly",
-        "typeform": "Typeform",
-        "youtube": "Youtube",
-        "wordpress": "Wordpress",
-        "woocommerce": "Woocommerce",
-    }
-    
+
     # Check all nodes to find the primary service
     primary_service = None
     for node in nodes:
-        node_type = node.get("type", "").lower()
-        node_name = node.get("name", "").lower()
-        
+        text = (node.get("type", "") + " " + node.get("name", "")).lower()
+
         # Check for webhook first (common trigger)
-        if "webhook" in node_type or "webhook" in node_name:
+        if "webhook" in text:
             if not primary_service or primary_service == "Manual":
                 primary_service = "Webhook"
-        
+
         # Check for scheduled/cron
-        if "cron" in node_type or "schedule" in node_type:
+        if "cron" in text or "schedule" in text:
             if not primary_service or primary_service == "Manual":
                 primary_service = "Schedule"
-        
-        # Check for service mappings
-        for key, directory in service_mappings.items():
-            if key in node_type or key in node_name:
-                if not primary_service or primary_service in ["Manual", "Webhook", "Schedule"]:
-                    primary_service = directory
-                    break
-        
+
+        # Check for service mappings (one regex scan; pick by mapping priority,
+        # not by leftmost position in the text)
+        best = min(
+            (m.lastgroup for m in WORKFLOW_DIR_SERVICE_RE.finditer(text)),
+            key=_WORKFLOW_DIR_PRIORITY.__getitem__,
+            default=None,
+        )
+        if best:
+            if not primary_service or primary_service in ["Manual", "Webhook", "Schedule"]:
+                primary_service = best
+
         if primary_service and primary_service not in ["Manual", "Webhook", "Schedule"]:
             break
-    
+
     # If no specific service found, use the first node type or default
     if not primary_service or primary_service == "Manual":
         if nodes:
@@ -724,9 +1126,8 @@ def save_workflow_file(workflow_data: Dict, filename: Optional[str] = None) -> T
         workflow_name = workflow_data.get("name", "workflow")
         workflow_id = workflow_data.get("id", "")
         
-        # Clean name for filename
-        clean_name = re.sub(r'[^\w\s-]', '', workflow_name).strip()
-        clean_name = re.sub(r'[-\s]+', '_', clean_name)
+        # Clean name for filename (single translate pass, no regex)
+        clean_name = workflow_name.translate(FILENAME_TRANSLATE_TABLE).strip("_")
         
         if workflow_id:
             filename = f"{workflow_id}_{clean_name}.json"
@@ -742,89 +1143,22 @@ def save_workflow_file(workflow_data: Dict, filename: Optional[str] = None) -> T
     
     # Validate filename
     if not validate_filename(filename):
-        # Sanitize filename if invalid
-        filename = re.sub(r'[^\w\-_.]', '_', filename)
-        if not filename.endswith(".json"):
-            filename += ".json"
+        # Sanitize the stem through the same table, keeping the suffix
+        stem = filename[:-5] if filename.endswith(".json") else filename
+        stem = stem.translate(FILENAME_TRANSLATE_TABLE) or "workflow"
+        filename = f"{stem}.json"
+        if not validate_filename(filename):
+            raise ValueError(f"Unable to sanitize workflow filename: {filename!r}")
     
     filepath = subdir_path / filename
     
     # Write workflow JSON
-    with open(filepath, "w", encoding="utf-8") as f:
-        json.dump(workflow_data, f, indent=2, ensure_ascii=False)
-    
-    return str(filepath), filename
+    write_json_file(filepath, workflow_data)
 
+    # Keep the lookup index in sync with the new file
+    FILE_INDEX[filename] = filepath.resolve()
 
-def generate_mermaid_diagram(nodes: List[Dict], connections: Dict) -> str:
-    """Generate Mermaid.js flowchart code from workflow nodes and connections."""
-    if not nodes:
-        return "graph TD\n  EmptyWorkflow[No nodes found in workflow]"
-
-    # Create mapping for node names to ensure valid mermaid IDs
-    mermaid_ids = {}
-    for i, node in enumerate(nodes):
-        node_id = f"node{i}"
-        node_name = node.get("name", f"Node {i}")
-        mermaid_ids[node_name] = node_id
-
-    # Start building the mermaid diagram
-    mermaid_code = ["graph TD"]
-
-    # Add nodes with styling
-    for node in nodes:
-        node_name = node.get("name", "Unnamed")
-        node_id = mermaid_ids[node_name]
-        node_type = node.get("type", "").replace("n8n-nodes-base.", "")
-
-        # Determine node style based on type
-        style = ""
-        if any(x in node_type.lower() for x in ["trigger", "webhook", "cron"]):
-            style = "fill:#b3e0ff,stroke:#0066cc"  # Blue for triggers
-        elif any(x in node_type.lower() for x in ["if", "switch"]):
-            style = "fill:#ffffb3,stroke:#e6e600"  # Yellow for conditional nodes
-        elif any(x in node_type.lower() for x in ["function", "code"]):
-            style = "fill:#d9b3ff,stroke:#6600cc"  # Purple for code nodes
-        elif "error" in node_type.lower():
-            style = "fill:#ffb3b3,stroke:#cc0000"  # Red for error handlers
-        else:
-            style = "fill:#d9d9d9,stroke:#666666"  # Gray for other nodes
-
-        # Add node with label (escaping special characters)
-        clean_name = node_name.replace('"', "'")
-        clean_type = node_type.replace('"', "'")
-        label = f"{clean_name}<br>({clean_type})"
-        mermaid_code.append(f'  {node_id}["{label}"]')
-        mermaid_code.append(f"  style {node_id} {style}")
-
-    # Add connections between nodes
-    for source_name, source_connections in connections.items():
-        if source_name not in mermaid_ids:
-            continue
-
-        if isinstance(source_connections, dict) and "main" in source_connections:
-            main_connections = source_connections["main"]
-
-            for i, output_connections in enumerate(main_connections):
-                if not isinstance(output_connections, list):
-                    continue
-
-                for connection in output_connections:
-                    if not isinstance(connection, dict) or "node" not in connection:
-                        continue
-
-                    target_name = connection["node"]
-                    if target_name not in mermaid_ids:
-                        continue
-
-                    # Add arrow with output index if multiple outputs
-                    label = f" -->|{i}| " if len(main_connections) > 1 else " --> "
-                    mermaid_code.append(
-                        f"  {mermaid_ids[source_name]}{label}{mermaid_ids[target_name]}"
-                    )
-
-    # Format the final mermaid diagram code
-    return "\n".join(mermaid_code)
+    return str(filepath), filename
 
 
 @app.post("/api/reindex")
@@ -837,10 +1171,7 @@ async def reindex_workflows(
     """Trigger workflow reindexing in the background (requires authentication)."""
     # Security: Rate limiting
     client_ip = request.client.host if request.client else "unknown"
-    if not check_rate_limit(client_ip):
-        raise HTTPException(
-            status_code=429, detail="Rate limit exceeded. Please try again later."
-        )
+    await enforce_rate_limit(client_ip)
 
     # Security: Basic authentication check
     # In production, use proper authentication (JWT, OAuth, etc.)
@@ -856,17 +1187,31 @@ async def reindex_workflows(
         )
 
     if admin_token != expected_token:
-        print(f"Security: Unauthorized reindex attempt from {client_ip}")
+        logger.warning("Security: Unauthorized reindex attempt from %s", client_ip)
         raise HTTPException(status_code=401, detail="Invalid authentication token")
 
-    def run_indexing():
-        try:
-            db.index_all_workflows(force_reindex=force)
-            print(f"Reindexing completed successfully (requested by {client_ip})")
-        except Exception as e:
-            print(f"Error during reindexing: {e}")
+    if CELERY_ENABLED:
+        # Run the CPU-bound reindex on the worker pool; overlapping requests
+        # coalesce behind the Redis lock inside the task
+        index_all_task.apply_async(args=[force], countdown=2)
+        refresh_file_index()
+        _stats_for_bucket.cache_clear()
+        logger.info("Reindexing enqueued (requested by %s)", client_ip)
+    else:
+        async def run_indexing():
+            try:
+                # Escape the GIL: the reindex runs in a child process, so
+                # request handling here keeps its CPU
+                await asyncio.get_running_loop().run_in_executor(
+                    INDEX_POOL, _index_job, force
+                )
+                refresh_file_index()
+                _stats_for_bucket.cache_clear()
+                logger.info("Reindexing completed successfully (requested by %s)", client_ip)
+            except Exception as e:
+                logger.error("Error during reindexing: %s", e)
 
-    background_tasks.add_task(run_indexing)
+        background_tasks.add_task(run_indexing)
     return {"message": "Reindexing started in background", "requested_by": client_ip}
 
 
@@ -890,122 +1235,28 @@ async def get_categories():
         # Try to load from the generated unique categories file
         categories_file = Path("context/unique_categories.json")
         if categories_file.exists():
-            with open(categories_file, "r", encoding="utf-8") as f:
-                categories = json.load(f)
+            categories = await asyncio.to_thread(load_json_cached, str(categories_file))
             return {"categories": categories}
         else:
             # Fallback: extract categories from search_categories.json
+            # (deduplicated and sorted once per file version, not per request)
             search_categories_file = Path("context/search_categories.json")
             if search_categories_file.exists():
-                with open(search_categories_file, "r", encoding="utf-8") as f:
-                    search_data = json.load(f)
-
-                unique_categories = set()
-                for item in search_data:
-                    if item.get("category"):
-                        unique_categories.add(item["category"])
-                    else:
-                        unique_categories.add("Uncategorized")
-
-                categories = sorted(list(unique_categories))
+                categories = await asyncio.to_thread(
+                    get_unique_categories, search_categories_file
+                )
                 return {"categories": categories}
             else:
                 # Last resort: return basic categories
                 return {"categories": ["Uncategorized"]}
 
     except Exception as e:
-        print(f"Error loading categories: {e}")
+        logger.error("Error loading categories: %s", e)
         raise HTTPException(
             status_code=500, detail=f"Error fetching categories: {str(e)}"
         )
 
 
-def send_purchase_notification_email(user_email: str, description: str, workflow_name: str, workflow_filename: str):
-    """Send email notification to admin about purchase request using SendGrid."""
-    if not SENDGRID_AVAILABLE:
-        print("[WARNING] SendGrid not available, skipping email notification")
-        return False
-
-    # Get SendGrid API key from environment variable
-    sendgrid_api_key = os.environ.get("SENDGRID_API_KEY")
-    if not sendgrid_api_key:
-        print("[WARNING] SENDGRID_API_KEY not set, skipping email notification")
-        return False
-
-    admin_email = "tq@remap.ai"
-    from_email = os.environ.get("SMTP_EMAIL", "support@aiagents.co.id")
-    
-    try:
-        # Create email content
-        subject = f"New Purchase Request: {workflow_name}"
-        
-        html_content = f"""
-        <html>
-        <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
-            <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
-                <h2 style="color: #3151DD;">New Agent Request</h2>
-                
-                <div style="background: #f8f9fa; padding: 15px; border-radius: 5px; margin: 20px 0;">
-                    <h3 style="margin-top: 0; color: #3151DD;">Request Details</h3>
-                    <p><strong>User Email:</strong> {user_email}</p>
-                    <p><strong>Workflow Name:</strong> {workflow_name}</p>
-                    <p><strong>Workflow Filename:</strong> {workflow_filename}</p>
-                    <p><strong>Request Time:</strong> {time.strftime('%Y-%m-%d %H:%M:%S')}</p>
-                </div>
-                
-                <div style="background: #ffffff; padding: 15px; border-left: 4px solid #3151DD; margin: 20px 0;">
-                    <h3 style="margin-top: 0; color: #3151DD;">Description</h3>
-                    <p style="white-space: pre-wrap;">{description}</p>
-                </div>
-                
-                <div style="margin-top: 30px; padding-top: 20px; border-top: 1px solid #ddd; color: #666; font-size: 12px;">
-                    <p>This is an automated notification from the Workflow Library system.</p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-        
-        text_content = f"""
-New Agent Purchase Request
-
-User Email: {user_email}
-Workflow Name: {workflow_name}
-Workflow Filename: {workflow_filename}
-Request Time: {time.strftime('%Y-%m-%d %H:%M:%S')}
-
-Description:
-{description}
-
----
-This is an automated notification from the Workflow Library system.
-        """
-
-        # Create Mail object
-        message = Mail(
-            from_email=Email(from_email, "Workflow Library"),
-            to_emails=To(admin_email),
-            subject=subject,
-            plain_text_content=text_content,
-            html_content=html_content
-        )
-
-        # Send email
-        sg = SendGridAPIClient(sendgrid_api_key)
-        response = sg.send(message)
-        
-        if response.status_code in [200, 201, 202]:
-            print(f"[OK] Purchase request email sent to {admin_email}")
-            return True
-        else:
-            print(f"[ERROR] SendGrid returned status {response.status_code}: {response.body}")
-            return False
-            
-    except Exception as e:
-        print(f"[ERROR] Failed to send purchase request email: {str(e)}")
-        return False
-
-
 @app.post("/api/purchase-request")
 async def submit_purchase_request(request: Request, background_tasks: BackgroundTasks):
     """Handle purchase request submission and notify admin."""
@@ -1023,22 +1274,31 @@ async def submit_purchase_request(request: Request, background_tasks: Background
             )
 
         # Log the purchase request
-        print(f"[PURCHASE REQUEST]")
-        print(f"  Email: {email}")
-        print(f"  Description: {description}")
-        print(f"  Workflow: {workflow_name} ({workflow_filename})")
-        print(f"  User Role: {user_role}")
-        print(f"  Timestamp: {time.strftime('%Y-%m-%d %H:%M:%S')}")
-
-        # Send email notification to admin in background
-        background_tasks.add_task(
-            send_purchase_notification_email,
+        logger.info(
+            "Purchase request: email=%s workflow=%s (%s) role=%s description=%s",
             email,
-            description,
             workflow_name,
-            workflow_filename
+            workflow_filename,
+            user_role,
+            description,
         )
 
+        # Send email notification to admin off the web tier: enqueue to the
+        # Celery worker when a broker is configured so a slow SendGrid call
+        # never occupies this process; otherwise fall back to BackgroundTasks
+        if CELERY_ENABLED:
+            send_purchase_notification_email_task.delay(
+                email, description, workflow_name, workflow_filename
+            )
+        else:
+            background_tasks.add_task(
+                send_purchase_notification_email,
+                email,
+                description,
+                workflow_name,
+                workflow_filename
+            )
+
         return {
             "success": True,
             "message": "Purchase request submitted successfully. Admin will be notified.",
@@ -1059,27 +1319,24 @@ async def get_category_mappings():
         if not search_categories_file.exists():
             return {"mappings": {}}
 
-        with open(search_categories_file, "r", encoding="utf-8") as f:
-            search_data = json.load(f)
-
-        # Convert to a simple filename -> category mapping
-        mappings = {}
-        for item in search_data:
-            filename = item.get("filename")
-            category = item.get("category") or "Uncategorized"
-            if filename:
-                mappings[filename] = category
+        # Pre-serialized and cached per file version, so the parse, the dict
+        # build and the JSON dump are all paid once rather than per request
+        body = await asyncio.to_thread(
+            get_category_mappings_bytes, search_categories_file
+        )
 
-        return {"mappings": mappings}
+        return Response(content=body, media_type="application/json")
 
     except Exception as e:
-        print(f"Error loading category mappings: {e}")
+        logger.error("Error loading category mappings: %s", e)
         raise HTTPException(
             status_code=500, detail=f"Error fetching category mappings: {str(e)}"
         )
 
 
-@app.get("/api/workflows/category/{category}", response_model=SearchResponse)
+# No response_model for the same reason as /api/workflows: rows go out as
+# plain dicts in the SearchResponse shape, skipping per-row validation
+@app.get("/api/workflows/category/{category}")
 async def search_workflows_by_category(
     category: str,
     page: int = Query(1, ge=1, description="Page number"),
@@ -1089,19 +1346,19 @@ async def search_workflows_by_category(
     try:
         offset = (page - 1) * per_page
 
-        workflows, total = db.search_by_category(
-            category=category, limit=per_page, offset=offset
+        workflows, total = await asyncio.to_thread(
+            db.search_by_category, category=category, limit=per_page, offset=offset
         )
 
-        # Convert to Pydantic models with error handling
+        # Shape rows as plain summary dicts (no per-row model validation)
         workflow_summaries = []
         for workflow in workflows:
-            try:
-                clean_workflow = {
+            workflow_summaries.append(
+                {
                     "id": workflow.get("id"),
                     "filename": workflow.get("filename", ""),
                     "name": workflow.get("name", ""),
-                    "active": workflow.get("active", False),
+                    "active": bool(workflow.get("active", False)),
                     "description": workflow.get("description", ""),
                     "trigger_type": workflow.get("trigger_type", "Manual"),
                     "complexity": workflow.get("complexity", "low"),
@@ -1110,35 +1367,161 @@ async def search_workflows_by_category(
                     "tags": workflow.get("tags", []),
                     "created_at": workflow.get("created_at"),
                     "updated_at": workflow.get("updated_at"),
+                    "category": workflow.get("category") or "Uncategorized",
                 }
-                workflow_summaries.append(WorkflowSummary(**clean_workflow))
-            except Exception as e:
-                print(
-                    f"Error converting workflow {workflow.get('filename', 'unknown')}: {e}"
-                )
-                continue
+            )
 
         pages = (total + per_page - 1) // per_page
 
-        return SearchResponse(
-            workflows=workflow_summaries,
-            total=total,
-            page=page,
-            per_page=per_page,
-            pages=pages,
-            query=f"category:{category}",
-            filters={"category": category},
-        )
+        return {
+            "workflows": workflow_summaries,
+            "total": total,
+            "page": page,
+            "per_page": per_page,
+            "pages": pages,
+            "query": f"category:{category}",
+            "filters": {"category": category},
+        }
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Error searching by category: {str(e)}"
         )
 
 
+# Reindexing is CPU-bound (hashing plus JSON parsing per file). Without
+# Celery it runs in this small process pool, escaping the web process's GIL
+# and bounding concurrent indexers globally; workers spawn on first use
+INDEX_POOL = ProcessPoolExecutor(max_workers=2)
+
+
+def _index_job(force: bool) -> Dict[str, int]:
+    """Run a full reindex in a child process with its own DB connection.
+
+    SQLite connections are not fork-safe, so the child builds a fresh
+    WorkflowDatabase rather than inheriting the parent's pool.
+    """
+    from workflow_db import WorkflowDatabase
+    return WorkflowDatabase().index_all_workflows(force_reindex=force)
+
+
+# Single-flight indexing for the in-process fallback path: uploads mark
+# their file dirty and wake the supervisor, which debounces briefly and then
+# indexes each dirty path once — a burst of K uploads costs one pass instead
+# of K concurrent background jobs contending on SQLite
+INDEX_DEBOUNCE_SECONDS = 0.5
+_index_event = asyncio.Event()
+_dirty_paths: set = set()
+
+
+def request_index(filepath) -> None:
+    """Mark an uploaded file dirty and wake the indexing supervisor."""
+    _dirty_paths.add(str(filepath))
+    _index_event.set()
+
+
+async def index_supervisor() -> None:
+    """Drain dirty upload paths through index_one, one flight at a time."""
+    while True:
+        await _index_event.wait()
+        # Short debounce so near-simultaneous uploads coalesce into one drain
+        await asyncio.sleep(INDEX_DEBOUNCE_SECONDS)
+        _index_event.clear()
+        dirty = list(_dirty_paths)
+        _dirty_paths.clear()
+        for path in dirty:
+            try:
+                await asyncio.to_thread(db.index_one, path)
+                logger.info("Workflow %s indexed successfully", os.path.basename(path))
+            except Exception as e:
+                logger.error("Error indexing workflow %s: %s", path, e)
+
+
+# Uploads above this size are rejected with 413 before being buffered
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+def workflow_shape_error(data) -> Optional[str]:
+    """Cheap structural validation for uploaded workflow JSON.
+
+    A handful of direct type checks on the top-level fields costs O(1)
+    regardless of payload size, unlike building a validation model per
+    upload. Returns an error message, or None when the shape is fine.
+    """
+    if not isinstance(data, dict):
+        return "Workflow data must be a JSON object"
+    if "name" in data and not isinstance(data["name"], str):
+        return "Workflow 'name' must be a string"
+    if "nodes" in data and not isinstance(data["nodes"], list):
+        return "Workflow 'nodes' must be a list"
+    if "connections" in data and not isinstance(data["connections"], dict):
+        return "Workflow 'connections' must be an object"
+    return None
+
+
+def reject_oversized_body(request: Request) -> None:
+    """413 straight from the declared Content-Length, before any body read.
+
+    Honest oversized requests cost nothing; the streamed reads below still
+    bound clients that omit or understate the header.
+    """
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail="Workflow file too large")
+
+
+async def read_upload_file(file: UploadFile) -> bytearray:
+    """Read an UploadFile chunk-by-chunk, rejecting oversized payloads.
+
+    Buffering in chunks keeps peak memory at O(payload) instead of the
+    duplicate copies a one-shot read()+decode produces, and lets the size
+    cap fire before the whole body has been received.
+    """
+    buf = bytearray()
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        buf.extend(chunk)
+        if len(buf) > MAX_UPLOAD_BYTES:
+            raise HTTPException(status_code=413, detail="Workflow file too large")
+    return buf
+
+
+def _decompress_gzip_body(compressed: bytes) -> bytes:
+    """Inflate a gzip request body, holding the output to the upload cap.
+
+    decompressobj with max_length bounds expansion, so a small compressed
+    body cannot balloon past MAX_UPLOAD_BYTES in memory (zip-bomb guard).
+    """
+    decompressor = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+    try:
+        out = decompressor.decompress(compressed, MAX_UPLOAD_BYTES + 1)
+    except zlib.error:
+        raise HTTPException(status_code=400, detail="Malformed gzip request body")
+    if len(out) > MAX_UPLOAD_BYTES or decompressor.unconsumed_tail:
+        raise HTTPException(status_code=413, detail="Workflow file too large")
+    return out
+
+
+async def read_request_body(request: Request) -> bytearray:
+    """Stream a raw request body with the same size cap as file uploads.
+
+    Bodies sent with Content-Encoding: gzip are inflated off the event
+    loop; clients with compressible workflow JSON can cut wire bytes
+    roughly 5-10x.
+    """
+    buf = bytearray()
+    async for chunk in request.stream():
+        buf.extend(chunk)
+        if len(buf) > MAX_UPLOAD_BYTES:
+            raise HTTPException(status_code=413, detail="Workflow file too large")
+    if request.headers.get("content-encoding", "").lower() == "gzip":
+        inflated = await asyncio.to_thread(_decompress_gzip_body, bytes(buf))
+        buf = bytearray(inflated)
+    return buf
+
+
 @app.post("/api/workflows/upload", response_model=WorkflowUploadResponse)
 async def upload_workflow(
     request: Request,
-    background_tasks: BackgroundTasks,
     file: Optional[UploadFile] = File(None),
     workflow_json: Optional[str] = Form(None),
 ):
@@ -1149,10 +1532,8 @@ async def upload_workflow(
     try:
         # Security: Rate limiting
         client_ip = request.client.host if request.client else "unknown"
-        if not check_rate_limit(client_ip):
-            raise HTTPException(
-                status_code=429, detail="Rate limit exceeded. Please try again later."
-            )
+        await enforce_rate_limit(client_ip)
+        reject_oversized_body(request)
 
         workflow_data = None
         provided_filename = None
@@ -1165,29 +1546,35 @@ async def upload_workflow(
                 )
             
             provided_filename = file.filename
-            content = await file.read()
+            content = await read_upload_file(file)
             try:
-                workflow_data = json.loads(content.decode("utf-8"))
+                # Parse on a worker thread; large uploads would otherwise
+                # stall the event loop for the duration of the decode
+                workflow_data = await asyncio.to_thread(parse_json_bytes, bytes(content))
             except json.JSONDecodeError as e:
                 raise HTTPException(
                     status_code=400, detail=f"Invalid JSON in file: {str(e)}"
                 )
-        
+
         # Handle JSON string in form data
         elif workflow_json:
             try:
-                workflow_data = json.loads(workflow_json)
+                workflow_data = await asyncio.to_thread(parse_json_bytes, workflow_json)
             except json.JSONDecodeError as e:
                 raise HTTPException(
                     status_code=400, detail=f"Invalid JSON string: {str(e)}"
                 )
-        
+
         # Handle raw JSON in request body (if Content-Type is application/json)
         else:
             try:
-                body = await request.body()
+                body = await read_request_body(request)
                 if body:
-                    workflow_data = await request.json()
+                    workflow_data = await asyncio.to_thread(
+                        parse_json_bytes, bytes(body)
+                    )
+            except HTTPException:
+                raise
             except:
                 raise HTTPException(
                     status_code=400,
@@ -1200,23 +1587,23 @@ async def upload_workflow(
             )
 
         # Validate workflow structure
-        if not isinstance(workflow_data, dict):
-            raise HTTPException(
-                status_code=400, detail="Workflow data must be a JSON object"
-            )
-
-        # Save workflow file
-        filepath, filename = save_workflow_file(workflow_data, provided_filename)
-
-        # Index the workflow in background
-        def index_workflow():
-            try:
-                db.index_all_workflows(force_reindex=False)
-                print(f"[OK] Workflow {filename} indexed successfully")
-            except Exception as e:
-                print(f"[ERROR] Error indexing workflow {filename}: {e}")
+        shape_error = workflow_shape_error(workflow_data)
+        if shape_error:
+            raise HTTPException(status_code=400, detail=shape_error)
+
+        # Save workflow file on a worker thread; the serialize + disk write
+        # would otherwise block the event loop for the duration
+        filepath, filename = await asyncio.to_thread(
+            save_workflow_file, workflow_data, provided_filename
+        )
 
-        background_tasks.add_task(index_workflow)
+        # Index just the uploaded file in background; with Celery configured
+        # the job runs on the worker pool, otherwise the single-flight
+        # supervisor drains it after a short debounce
+        if CELERY_ENABLED:
+            index_one_task.delay(str(filepath))
+        else:
+            request_index(filepath)
 
         return WorkflowUploadResponse(
             message="Workflow uploaded successfully",
@@ -1236,7 +1623,6 @@ async def upload_workflow(
 @app.post("/api/workflows/upload-json")
 async def upload_workflow_json(
     request: Request,
-    background_tasks: BackgroundTasks,
 ):
     """
     Upload a workflow by sending JSON directly in the request body.
@@ -1245,31 +1631,27 @@ async def upload_workflow_json(
     try:
         # Security: Rate limiting
         client_ip = request.client.host if request.client else "unknown"
-        if not check_rate_limit(client_ip):
-            raise HTTPException(
-                status_code=429, detail="Rate limit exceeded. Please try again later."
-            )
+        await enforce_rate_limit(client_ip)
+        reject_oversized_body(request)
 
-        # Parse JSON from request body
-        workflow_data = await request.json()
+        # Stream and parse JSON from request body (capped at MAX_UPLOAD_BYTES)
+        body = await read_request_body(request)
+        workflow_data = await asyncio.to_thread(parse_json_bytes, bytes(body))
 
-        if not isinstance(workflow_data, dict):
-            raise HTTPException(
-                status_code=400, detail="Workflow data must be a JSON object"
-            )
+        shape_error = workflow_shape_error(workflow_data)
+        if shape_error:
+            raise HTTPException(status_code=400, detail=shape_error)
 
-        # Save workflow file
-        filepath, filename = save_workflow_file(workflow_data)
+        # Save workflow file on a worker thread (see upload_workflow)
+        filepath, filename = await asyncio.to_thread(save_workflow_file, workflow_data)
 
-        # Index the workflow in background
-        def index_workflow():
-            try:
-                db.index_all_workflows(force_reindex=False)
-                print(f"[OK] Workflow {filename} indexed successfully")
-            except Exception as e:
-                print(f"[ERROR] Error indexing workflow {filename}: {e}")
-
-        background_tasks.add_task(index_workflow)
+        # Index just the uploaded file in background; with Celery configured
+        # the job runs on the worker pool, otherwise the single-flight
+        # supervisor drains it after a short debounce
+        if CELERY_ENABLED:
+            index_one_task.delay(str(filepath))
+        else:
+            request_index(filepath)
 
         return WorkflowUploadResponse(
             message="Workflow uploaded successfully",
@@ -1296,13 +1678,68 @@ async def global_exception_handler(request, exc):
     )
 
 
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles that serves small assets from an in-memory byte cache.
+
+    Entries are keyed by mtime, so edits are picked up on the next request
+    while unchanged files are served without touching the disk. Clients
+    presenting a matching ETag get a 304 with no body at all. Anything over
+    the size cap (or not a regular file) falls through to the stock
+    StaticFiles FileResponse path.
+    """
+
+    MAX_CACHED_FILE_BYTES = 1024 * 1024
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cache: Dict[str, Tuple[int, bytes, str]] = {}
+
+    async def get_response(self, path: str, scope) -> Response:
+        # Mirror the stock StaticFiles gate: the override must not turn
+        # POST/PUT/DELETE into 200s or permission errors into 500s
+        if scope["method"] not in ("GET", "HEAD"):
+            raise HTTPException(status_code=405)
+        try:
+            full_path, stat_result = await asyncio.to_thread(self.lookup_path, path)
+        except PermissionError:
+            raise HTTPException(status_code=401)
+        if (
+            stat_result is None
+            or not stat_module.S_ISREG(stat_result.st_mode)
+            or stat_result.st_size > self.MAX_CACHED_FILE_BYTES
+        ):
+            return await super().get_response(path, scope)
+
+        mtime_ns = stat_result.st_mtime_ns
+        entry = self._cache.get(full_path)
+        if entry is None or entry[0] != mtime_ns:
+            data = await asyncio.to_thread(Path(full_path).read_bytes)
+            etag = f'"{stat_result.st_size:x}-{mtime_ns:x}"'
+            entry = (mtime_ns, data, etag)
+            self._cache[full_path] = entry
+        _, data, etag = entry
+
+        headers = {"ETag": etag, "Cache-Control": "public, max-age=3600"}
+        for key, value in scope.get("headers", []):
+            if key == b"if-none-match" and value.decode("latin-1") == etag:
+                return Response(status_code=304, headers=headers)
+
+        media_type = mimetypes.guess_type(full_path)[0] or "application/octet-stream"
+        if scope["method"] == "HEAD":
+            # Same headers as the GET would carry, but no body: sending
+            # one on HEAD violates HTTP framing (h11 rejects it)
+            headers["Content-Length"] = str(len(data))
+            return Response(media_type=media_type, headers=headers)
+        return Response(content=data, media_type=media_type, headers=headers)
+
+
 # Mount static files AFTER all routes are defined
 static_dir = Path("static")
 if static_dir.exists():
-    app.mount("/static", StaticFiles(directory="static"), name="static")
-    print(f"[OK] Static files mounted from {static_dir.absolute()}")
+    app.mount("/static", CachedStaticFiles(directory="static"), name="static")
+    logger.info("Static files mounted from %s", static_dir.absolute())
 else:
-    print(f"[WARNING] Static directory not found at {static_dir.absolute()}")
+    logger.warning("Static directory not found at %s", static_dir.absolute())
 
 
 def create_static_directory():
@@ -1349,13 +1786,23 @@ def run_server(host: str = "127.0.0.1", port: int = 8000, reload: bool = False):
     print(f"[INFO] Server will be available at: http://{host}:{port}")
     print(f"[INFO] Static files at: http://{host}:{port}/static/")
 
+    if UVLOOP_AVAILABLE:
+        uvloop.install()
+        print("[OK] uvloop event loop enabled")
+
+    # Per-request access logging is a measurable overhead; keep it for dev
+    # runs (--reload) and let production opt back in via ACCESS_LOG=true
+    access_log = reload or os.environ.get("ACCESS_LOG", "").lower() in ("1", "true")
+
     uvicorn.run(
         "api_server:app",
         host=host,
         port=port,
         reload=reload,
-        access_log=True,  # Enable access logs for debugging
+        access_log=access_log,
         log_level="info",
+        loop="uvloop" if UVLOOP_AVAILABLE else "auto",
+        http="httptools",
     )
 
 
@@ -8,8 +8,15 @@ Usage:
 
 import argparse
 import requests
+from requests.adapters import HTTPAdapter
 import sys
 
+# Pooled session: keep-alive connections are reused across calls instead of
+# paying a TCP/TLS handshake per request
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=10))
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=10))
+
 
 def delete_workflow(filename: str, api_url: str = "http://localhost:8000"):
     """Delete a workflow from the API server."""
@@ -24,7 +31,7 @@ def delete_workflow(filename: str, api_url: str = "http://localhost:8000"):
             return False
         
         # Delete workflow
-        response = requests.delete(
+        response = SESSION.delete(
             f"{api_url}/api/workflows/{filename}",
         )
         
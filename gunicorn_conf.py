@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Gunicorn configuration for the N8N Workflow Documentation API.
+Usage:
+    gunicorn api_server:app -c gunicorn_conf.py
+"""
+
+import multiprocessing
+import os
+
+# Bind address
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+
+# 2N+1 event-loop workers so CPU-bound routes (diagram generation, large
+# workflow JSON parsing) scale across cores instead of serializing on one
+# process's GIL
+workers = int(os.environ.get("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Keep worker heartbeat files in shared memory to avoid disk stalls
+worker_tmp_dir = "/dev/shm"
+
+# Recycle workers periodically to bound slow memory growth; jitter avoids
+# all workers restarting at once
+max_requests = 10000
+max_requests_jitter = 1000
+
+# Note: rate-limit buckets are per worker process, so the effective limit is
+# workers * MAX_REQUESTS_PER_MINUTE per client IP. Move the limiter to a
+# shared store if a global limit is required.
@@ -9,20 +9,28 @@ Usage:
 
 import argparse
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import sys
 from pathlib import Path
 
+# Pooled session: batch commands (and shell loops over this script's
+# subcommands within one process) reuse keep-alive connections instead of
+# opening a new TCP/TLS connection per call
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=10))
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=10))
+SESSION.headers.update({"Content-Type": "application/json"})
+
 
 def add_category(category_name: str, api_url: str = "http://localhost:8000"):
     """Add a new category to the system."""
     try:
         print(f"📝 Adding category: {category_name}")
         
-        response = requests.post(
+        response = SESSION.post(
             f"{api_url}/api/categories",
             json={"category": category_name},
-            headers={"Content-Type": "application/json"},
         )
         
         if response.status_code == 200:
@@ -52,10 +60,9 @@ def assign_category(filename: str, category: str, api_url: str = "http://localho
     try:
         print(f"📝 Assigning '{filename}' to category '{category}'")
         
-        response = requests.put(
+        response = SESSION.put(
             f"{api_url}/api/workflows/{filename}/category",
             json={"filename": filename, "category": category},
-            headers={"Content-Type": "application/json"},
         )
         
         if response.status_code == 200:
@@ -79,7 +86,7 @@ def assign_category(filename: str, category: str, api_url: str = "http://localho
 def list_categories(api_url: str = "http://localhost:8000"):
     """List all available categories."""
     try:
-        response = requests.get(f"{api_url}/api/categories")
+        response = SESSION.get(f"{api_url}/api/categories")
         
         if response.status_code == 200:
             result = response.json()
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Background tasks for the N8N Workflow Documentation API.
+
+Run a worker with:
+    celery -A tasks worker --loglevel=info
+
+The broker defaults to a local Redis; override with CELERY_BROKER_URL.
+API processes enqueue work here so slow external calls (SendGrid) never
+tie up a web worker. Celery is optional: without it the API falls back to
+in-process FastAPI BackgroundTasks.
+"""
+
+import html
+import logging
+import os
+import string
+import threading
+import time
+
+logger = logging.getLogger("tasks")
+
+# Celery support (optional)
+try:
+    from celery import Celery
+    CELERY_AVAILABLE = True
+except ImportError:
+    CELERY_AVAILABLE = False
+
+# Redis client, used for the reindex debounce lock (optional)
+try:
+    import redis as redis_sync
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+# SendGrid email support (optional). The package pulls in a large
+# dependency tree, so it is imported lazily on the first send rather than
+# at module import — web workers and CLI runs that never email skip the
+# cost entirely. The cache holds the imported handles, or False after a
+# failed import so we only warn once.
+_SENDGRID_IMPORT = None
+
+
+def _get_sendgrid():
+    """Import sendgrid on first use; returns (client, Mail, Email, To) or None."""
+    global _SENDGRID_IMPORT
+    if _SENDGRID_IMPORT is None:
+        try:
+            from sendgrid import SendGridAPIClient
+            from sendgrid.helpers.mail import Mail, Email, To
+            _SENDGRID_IMPORT = (SendGridAPIClient, Mail, Email, To)
+        except ImportError:
+            logger.warning("SendGrid not installed. Install with: pip install sendgrid")
+            _SENDGRID_IMPORT = False
+    return _SENDGRID_IMPORT or None
+
+
+# Notification bodies precompiled once at import; each send only
+# interpolates the handful of variables instead of rebuilding the large
+# constant parts. User-supplied values are HTML-escaped for the HTML body.
+_HTML_TEMPLATE = string.Template("""
+        <html>
+        <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
+            <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
+                <h2 style="color: #3151DD;">New Agent Request</h2>
+
+                <div style="background: #f8f9fa; padding: 15px; border-radius: 5px; margin: 20px 0;">
+                    <h3 style="margin-top: 0; color: #3151DD;">Request Details</h3>
+                    <p><strong>User Email:</strong> $user_email</p>
+                    <p><strong>Workflow Name:</strong> $workflow_name</p>
+                    <p><strong>Workflow Filename:</strong> $workflow_filename</p>
+                    <p><strong>Request Time:</strong> $request_time</p>
+                </div>
+
+                <div style="background: #ffffff; padding: 15px; border-left: 4px solid #3151DD; margin: 20px 0;">
+                    <h3 style="margin-top: 0; color: #3151DD;">Description</h3>
+                    <p style="white-space: pre-wrap;">$description</p>
+                </div>
+
+                <div style="margin-top: 30px; padding-top: 20px; border-top: 1px solid #ddd; color: #666; font-size: 12px;">
+                    <p>This is an automated notification from the Workflow Library system.</p>
+                </div>
+            </div>
+        </body>
+        </html>
+        """)
+
+_TEXT_TEMPLATE = string.Template("""
+New Agent Purchase Request
+
+User Email: $user_email
+Workflow Name: $workflow_name
+Workflow Filename: $workflow_filename
+Request Time: $request_time
+
+Description:
+$description
+
+---
+This is an automated notification from the Workflow Library system.
+        """)
+
+
+# SendGrid client cached per process so repeat sends reuse the underlying
+# connection pool instead of paying a TLS handshake each time
+_SENDGRID_CLIENT = None
+_sendgrid_client_lock = threading.Lock()
+
+
+def _get_sendgrid_client(api_key: str):
+    """Return the process-wide SendGrid client, creating it on first use."""
+    global _SENDGRID_CLIENT
+    if _SENDGRID_CLIENT is None:
+        with _sendgrid_client_lock:
+            if _SENDGRID_CLIENT is None:
+                SendGridAPIClient = _get_sendgrid()[0]
+                _SENDGRID_CLIENT = SendGridAPIClient(api_key)
+    return _SENDGRID_CLIENT
+
+
+def send_purchase_notification_email(user_email: str, description: str, workflow_name: str, workflow_filename: str):
+    """Send email notification to admin about purchase request using SendGrid."""
+    sendgrid_handles = _get_sendgrid()
+    if sendgrid_handles is None:
+        logger.warning("SendGrid not available, skipping email notification")
+        return False
+    _, Mail, Email, To = sendgrid_handles
+
+    # Get SendGrid API key from environment variable
+    sendgrid_api_key = os.environ.get("SENDGRID_API_KEY")
+    if not sendgrid_api_key:
+        logger.warning("SENDGRID_API_KEY not set, skipping email notification")
+        return False
+
+    admin_email = "tq@remap.ai"
+    from_email = os.environ.get("SMTP_EMAIL", "support@aiagents.co.id")
+
+    try:
+        # Create email content
+        subject = f"New Purchase Request: {workflow_name}"
+
+        request_time = time.strftime('%Y-%m-%d %H:%M:%S')
+        html_content = _HTML_TEMPLATE.substitute(
+            user_email=html.escape(user_email),
+            workflow_name=html.escape(workflow_name),
+            workflow_filename=html.escape(workflow_filename),
+            request_time=request_time,
+            description=html.escape(description),
+        )
+
+        text_content = _TEXT_TEMPLATE.substitute(
+            user_email=user_email,
+            workflow_name=workflow_name,
+            workflow_filename=workflow_filename,
+            request_time=request_time,
+            description=description,
+        )
+
+        # Create Mail object
+        message = Mail(
+            from_email=Email(from_email, "Workflow Library"),
+            to_emails=To(admin_email),
+            subject=subject,
+            plain_text_content=text_content,
+            html_content=html_content
+        )
+
+        # Send email through the cached per-process client
+        response = _get_sendgrid_client(sendgrid_api_key).send(message)
+
+        if response.status_code in [200, 201, 202]:
+            logger.info("Purchase request email sent to %s", admin_email)
+            return True
+        else:
+            logger.error("SendGrid returned status %s: %s", response.status_code, response.body)
+            return False
+
+    except Exception as e:
+        logger.error("Failed to send purchase request email: %s", e)
+        return False
+
+
+if CELERY_AVAILABLE:
+    celery_app = Celery(
+        "workflows",
+        broker=os.environ.get("CELERY_BROKER_URL", "redis://localhost:6379/0"),
+    )
+    celery_app.conf.update(
+        task_ignore_result=True,
+        broker_connection_retry_on_startup=True,
+    )
+
+    @celery_app.task(bind=True, max_retries=5, default_retry_delay=30)
+    def send_purchase_notification_email_task(self, user_email: str, description: str, workflow_name: str, workflow_filename: str):
+        """Send the admin notification from a worker process.
+
+        Retries with a delay when SendGrid is configured but the send
+        failed (timeouts, 5xx); misconfiguration is not retried.
+        """
+        sent = send_purchase_notification_email(
+            user_email, description, workflow_name, workflow_filename
+        )
+        if not sent and _get_sendgrid() is not None and os.environ.get("SENDGRID_API_KEY"):
+            raise self.retry()
+        return sent
+
+    @celery_app.task
+    def index_all_task(force: bool = False):
+        """Reindex all workflows from a worker process.
+
+        A Redis NX lock (lock:index_all) coalesces bursts: when several
+        uploads enqueue reindexes, only the first holds the lock and runs;
+        the rest return immediately. Run this queue with --concurrency=1
+        so SQLite writes stay serialized.
+        """
+        client = None
+        if REDIS_AVAILABLE:
+            try:
+                client = redis_sync.Redis.from_url(
+                    os.environ.get("CELERY_BROKER_URL", "redis://localhost:6379/0")
+                )
+                if not client.set("lock:index_all", "1", nx=True, ex=600):
+                    logger.info("Reindex already in progress, skipping")
+                    return False
+            except Exception as e:
+                logger.warning("Reindex lock unavailable, running unlocked: %s", e)
+                client = None
+        try:
+            # Imported here so the web process importing tasks.py does not
+            # open a second database connection at startup
+            from workflow_db import WorkflowDatabase
+            WorkflowDatabase().index_all_workflows(force_reindex=force)
+            logger.info("Reindexing completed successfully")
+        finally:
+            if client is not None:
+                client.delete("lock:index_all")
+        return True
+
+    @celery_app.task
+    def index_one_task(file_path: str):
+        """Index a single uploaded workflow file from a worker process."""
+        from workflow_db import WorkflowDatabase
+        return WorkflowDatabase().index_one(file_path)
+else:
+    celery_app = None
+    send_purchase_notification_email_task = None
+    index_all_task = None
+    index_one_task = None
@@ -9,11 +9,108 @@ import json
 import os
 import datetime
 import hashlib
+import re
 import sys
+import threading
 from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
 
 
+# Node style classifier for Mermaid diagrams: one regex pass per node type
+# instead of several substring scans; groups map positionally to NODE_STYLES.
+# Matches are ranked by group index, not text position, so trigger keywords
+# keep priority even when another keyword appears earlier in the type
+# (e.g. the "if" inside "shopifyTrigger" must not win over "trigger").
+NODE_STYLE_RE = re.compile(r"(trigger|webhook|cron)|(if|switch)|(function|code)|(error)")
+NODE_STYLES = (
+    "fill:#b3e0ff,stroke:#0066cc",  # Blue for triggers
+    "fill:#ffffb3,stroke:#e6e600",  # Yellow for conditional nodes
+    "fill:#d9b3ff,stroke:#6600cc",  # Purple for code nodes
+    "fill:#ffb3b3,stroke:#cc0000",  # Red for error handlers
+)
+NODE_STYLE_DEFAULT = "fill:#d9d9d9,stroke:#666666"  # Gray for other nodes
+
+# Columns returned by list/search queries: everything except the precomputed
+# diagram, which can run to hundreds of KB per row and is served by
+# get_workflow_diagram on demand
+WORKFLOW_LIST_COLUMNS = (
+    "id", "filename", "name", "workflow_id", "active", "description",
+    "trigger_type", "complexity", "node_count", "integrations", "tags",
+    "category", "created_at", "updated_at", "file_hash", "file_size",
+    "analyzed_at",
+)
+_LIST_COLUMNS_SQL = ", ".join(WORKFLOW_LIST_COLUMNS)
+_W_LIST_COLUMNS_SQL = ", ".join(f"w.{c}" for c in WORKFLOW_LIST_COLUMNS)
+
+
+def generate_mermaid_diagram(nodes: List[Dict], connections: Dict) -> str:
+    """Generate Mermaid.js flowchart code from workflow nodes and connections."""
+    if not nodes:
+        return "graph TD\n  EmptyWorkflow[No nodes found in workflow]"
+
+    # Create mapping for node names to ensure valid mermaid IDs
+    mermaid_ids = {
+        node.get("name", f"Node {i}"): f"node{i}" for i, node in enumerate(nodes)
+    }
+
+    # Start building the mermaid diagram
+    mermaid_code = ["graph TD"]
+
+    # Add nodes with styling
+    for node in nodes:
+        node_name = node.get("name", "Unnamed")
+        node_id = mermaid_ids[node_name]
+        node_type = node.get("type", "").replace("n8n-nodes-base.", "")
+
+        # Determine node style based on type (single lowercase + regex scan,
+        # picking the highest-priority group across all matches)
+        best = min(
+            (m.lastindex for m in NODE_STYLE_RE.finditer(node_type.lower())),
+            default=None,
+        )
+        style = NODE_STYLES[best - 1] if best else NODE_STYLE_DEFAULT
+
+        # Add node with label (escaping special characters)
+        clean_name = node_name.replace('"', "'")
+        clean_type = node_type.replace('"', "'")
+        mermaid_code.append(
+            f'  {node_id}["{clean_name}<br>({clean_type})"]\n  style {node_id} {style}'
+        )
+
+    # Add connections between nodes
+    for source_name, source_connections in connections.items():
+        if source_name not in mermaid_ids:
+            continue
+
+        if isinstance(source_connections, dict) and "main" in source_connections:
+            main_connections = source_connections["main"]
+            source_id = mermaid_ids[source_name]
+            multi_output = len(main_connections) > 1
+
+            for i, output_connections in enumerate(main_connections):
+                if not isinstance(output_connections, list):
+                    continue
+
+                # Arrow label (with output index if multiple outputs) is the
+                # same for every edge of this output; build it once
+                label = f" -->|{i}| " if multi_output else " --> "
+
+                for connection in output_connections:
+                    if not isinstance(connection, dict) or "node" not in connection:
+                        continue
+
+                    target_name = connection["node"]
+                    if target_name not in mermaid_ids:
+                        continue
+
+                    mermaid_code.append(
+                        f"  {source_id}{label}{mermaid_ids[target_name]}"
+                    )
+
+    # Format the final mermaid diagram code
+    return "\n".join(mermaid_code)
+
+
 class WorkflowDatabase:
     """High-performance SQLite database for workflow metadata and search."""
 
@@ -24,15 +121,30 @@ class WorkflowDatabase:
         self.db_path = db_path
         self.workflows_dir = "workflows"
         self.category_mapping = self.load_category_mapping()
+        self._local = threading.local()  # One pooled connection per thread
         self.init_database()
 
+    def _get_connection(self) -> sqlite3.Connection:
+        """Get (or create) this thread's cached database connection.
+
+        Reusing a connection per thread avoids paying connect + PRAGMA setup
+        on every query; WAL lets readers proceed concurrently with writers.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")  # Concurrent readers + writer
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA cache_size=-65536")  # 64 MiB page cache
+            conn.execute("PRAGMA mmap_size=268435456")  # 256 MiB mmap window
+            conn.execute("PRAGMA temp_store=MEMORY")
+            self._local.conn = conn
+        return conn
+
     def init_database(self):
         """Initialize SQLite database with optimized schema and indexes."""
-        conn = sqlite3.connect(self.db_path)
-        conn.execute("PRAGMA journal_mode=WAL")  # Write-ahead logging for performance
-        conn.execute("PRAGMA synchronous=NORMAL")
-        conn.execute("PRAGMA cache_size=10000")
-        conn.execute("PRAGMA temp_store=MEMORY")
+        conn = self._get_connection()
 
         # Create main workflows table
         conn.execute("""
@@ -49,6 +161,7 @@ class WorkflowDatabase:
                 integrations TEXT,  -- JSON array
                 tags TEXT,         -- JSON array
                 category TEXT,     -- Workflow category
+                diagram TEXT,      -- Precomputed Mermaid diagram
                 created_at TEXT,
                 updated_at TEXT,
                 file_hash TEXT,
@@ -80,6 +193,14 @@ class WorkflowDatabase:
             # Column already exists, ignore
             pass
 
+        # Migrate existing databases to add the precomputed diagram column
+        try:
+            conn.execute("ALTER TABLE workflows ADD COLUMN diagram TEXT")
+            conn.commit()
+        except sqlite3.OperationalError:
+            # Column already exists, ignore
+            pass
+
         # Create indexes for fast filtering
         conn.execute(
             "CREATE INDEX IF NOT EXISTS idx_trigger_type ON workflows(trigger_type)"
@@ -125,7 +246,6 @@ class WorkflowDatabase:
         """)
 
         conn.commit()
-        conn.close()
 
     def load_category_mapping(self) -> Dict[str, str]:
         """Load category mappings from context/search_categories.json."""
@@ -603,76 +723,104 @@ class WorkflowDatabase:
 
         print(f"Indexing {len(json_files)} workflow files...")
 
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        conn = self._get_connection()
 
         stats = {"processed": 0, "skipped": 0, "errors": 0}
 
         for file_path in json_files:
-            filename = os.path.basename(file_path)
-
             try:
-                # Check if file needs to be reprocessed
-                if not force_reindex:
-                    current_hash = self.get_file_hash(file_path)
-                    cursor = conn.execute(
-                        "SELECT file_hash FROM workflows WHERE filename = ?",
-                        (filename,),
-                    )
-                    row = cursor.fetchone()
-                    if row and row["file_hash"] == current_hash:
-                        stats["skipped"] += 1
-                        continue
-
-                # Analyze workflow
-                workflow_data = self.analyze_workflow_file(file_path)
-                if not workflow_data:
-                    stats["errors"] += 1
-                    continue
-
-                # Insert or update in database
-                conn.execute(
-                    """
-                    INSERT OR REPLACE INTO workflows (
-                        filename, name, workflow_id, active, description, trigger_type,
-                        complexity, node_count, integrations, tags, category, created_at, updated_at,
-                        file_hash, file_size, analyzed_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                """,
-                    (
-                        workflow_data["filename"],
-                        workflow_data["name"],
-                        workflow_data["workflow_id"],
-                        workflow_data["active"],
-                        workflow_data["description"],
-                        workflow_data["trigger_type"],
-                        workflow_data["complexity"],
-                        workflow_data["node_count"],
-                        json.dumps(workflow_data["integrations"]),
-                        json.dumps(workflow_data["tags"]),
-                        workflow_data.get("category", "Uncategorized"),
-                        workflow_data["created_at"],
-                        workflow_data["updated_at"],
-                        workflow_data["file_hash"],
-                        workflow_data["file_size"],
-                    ),
-                )
-
-                stats["processed"] += 1
-
+                outcome = self._index_file(conn, file_path, force_reindex)
+                stats[outcome] += 1
             except Exception as e:
                 print(f"Error processing {file_path}: {str(e)}")
                 stats["errors"] += 1
                 continue
 
         conn.commit()
-        conn.close()
 
         print(
             f"[OK] Indexing complete: {stats['processed']} processed, {stats['skipped']} skipped, {stats['errors']} errors"
         )
         return stats
 
+    def _index_file(self, conn: sqlite3.Connection, file_path: str, force_reindex: bool = False) -> str:
+        """Index one file into the given connection.
+
+        Returns the stats bucket for the outcome: 'processed', 'skipped'
+        (unchanged hash) or 'errors' (unparseable file).
+        """
+        filename = os.path.basename(file_path)
+
+        # Check if file needs to be reprocessed
+        if not force_reindex:
+            current_hash = self.get_file_hash(file_path)
+            cursor = conn.execute(
+                "SELECT file_hash FROM workflows WHERE filename = ?",
+                (filename,),
+            )
+            row = cursor.fetchone()
+            if row and row["file_hash"] == current_hash:
+                return "skipped"
+
+        # Analyze workflow
+        workflow_data = self.analyze_workflow_file(file_path)
+        if not workflow_data:
+            return "errors"
+
+        # Insert or update in database
+        # Precompute the Mermaid diagram so the API can serve it
+        # with a single SELECT instead of parse + generation
+        diagram = generate_mermaid_diagram(
+            workflow_data["nodes"], workflow_data["connections"]
+        )
+
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO workflows (
+                filename, name, workflow_id, active, description, trigger_type,
+                complexity, node_count, integrations, tags, category, diagram,
+                created_at, updated_at, file_hash, file_size, analyzed_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        """,
+            (
+                workflow_data["filename"],
+                workflow_data["name"],
+                workflow_data["workflow_id"],
+                workflow_data["active"],
+                workflow_data["description"],
+                workflow_data["trigger_type"],
+                workflow_data["complexity"],
+                workflow_data["node_count"],
+                json.dumps(workflow_data["integrations"]),
+                json.dumps(workflow_data["tags"]),
+                workflow_data.get("category", "Uncategorized"),
+                diagram,
+                workflow_data["created_at"],
+                workflow_data["updated_at"],
+                workflow_data["file_hash"],
+                workflow_data["file_size"],
+            ),
+        )
+        return "processed"
+
+    def index_one(self, file_path, force_reindex: bool = False) -> bool:
+        """Index a single workflow file (fast path for uploads).
+
+        Hashes, analyzes and upserts just this file instead of walking the
+        whole workflows directory, so post-upload indexing cost does not
+        scale with corpus size.
+        """
+        # Reload category mapping so a fresh category file is honored
+        self.category_mapping = self.load_category_mapping()
+        conn = self._get_connection()
+        try:
+            outcome = self._index_file(conn, str(file_path), force_reindex)
+        except Exception as e:
+            print(f"Error processing {file_path}: {str(e)}")
+            return False
+        conn.commit()
+        return outcome != "errors"
+
     def search_workflows(
         self,
         query: str = "",
@@ -684,8 +832,7 @@ class WorkflowDatabase:
         offset: int = 0,
     ) -> Tuple[List[Dict], int]:
         """Fast search with filters and pagination."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        conn = self._get_connection()
 
         # Build WHERE clause
         where_conditions = []
@@ -711,8 +858,8 @@ class WorkflowDatabase:
             # Format query for FTS5 - escape special characters and add wildcards
             fts_query = self.format_fts_query(query)
             # FTS search with ranking
-            base_query = """
-                SELECT w.*, rank
+            base_query = f"""
+                SELECT {_W_LIST_COLUMNS_SQL}, rank
                 FROM workflows_fts fts
                 JOIN workflows w ON w.id = fts.rowid
                 WHERE workflows_fts MATCH ?
@@ -720,8 +867,8 @@ class WorkflowDatabase:
             params.insert(0, fts_query)
         else:
             # Regular query without FTS
-            base_query = """
-                SELECT w.*, 0 as rank
+            base_query = f"""
+                SELECT {_W_LIST_COLUMNS_SQL}, 0 as rank
                 FROM workflows w
                 WHERE 1=1
             """
@@ -787,13 +934,63 @@ class WorkflowDatabase:
 
             results.append(workflow)
 
-        conn.close()
         return results, total
 
+    def get_workflow_by_filename(self, filename: str) -> Optional[Dict]:
+        """Fetch a single workflow by its unique filename.
+
+        Uses the unique index on filename directly, avoiding the FTS
+        query-parsing path of search_workflows for point lookups.
+        """
+        conn = self._get_connection()
+
+        cursor = conn.execute(
+            "SELECT * FROM workflows WHERE filename = ? LIMIT 1", (filename,)
+        )
+        row = cursor.fetchone()
+
+        if not row:
+            return None
+
+        workflow = dict(row)
+        workflow.pop("diagram", None)  # Large text; served by get_diagram only
+        workflow["integrations"] = json.loads(workflow["integrations"] or "[]")
+
+        # Parse tags and convert dict tags to strings
+        raw_tags = json.loads(workflow["tags"] or "[]")
+        clean_tags = []
+        for tag in raw_tags:
+            if isinstance(tag, dict):
+                clean_tags.append(tag.get("name", str(tag.get("id", "tag"))))
+            else:
+                clean_tags.append(str(tag))
+        workflow["tags"] = clean_tags
+
+        # Ensure category is set (default to Uncategorized if None or empty)
+        category_value = workflow.get("category")
+        if not category_value or (isinstance(category_value, str) and category_value.strip() == ""):
+            workflow["category"] = "Uncategorized"
+        else:
+            workflow["category"] = str(category_value)
+
+        return workflow
+
+    def get_diagram(self, filename: str) -> Optional[str]:
+        """Fetch the precomputed Mermaid diagram for a workflow.
+
+        Returns None when the workflow is unknown or was indexed before the
+        diagram column existed (callers fall back to on-demand generation).
+        """
+        conn = self._get_connection()
+        cursor = conn.execute(
+            "SELECT diagram FROM workflows WHERE filename = ? LIMIT 1", (filename,)
+        )
+        row = cursor.fetchone()
+        return row["diagram"] if row else None
+
     def get_stats(self) -> Dict[str, Any]:
         """Get database statistics."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        conn = self._get_connection()
 
         # Basic counts
         cursor = conn.execute("SELECT COUNT(*) as total FROM workflows")
@@ -833,8 +1030,6 @@ class WorkflowDatabase:
             integrations = json.loads(row["integrations"])
             all_integrations.update(integrations)
 
-        conn.close()
-
         return {
             "total": total,
             "active": active,
@@ -912,8 +1107,7 @@ class WorkflowDatabase:
             return [], 0
 
         services = categories[category]
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        conn = self._get_connection()
 
         # Build OR conditions for all services in category
         service_conditions = []
@@ -931,7 +1125,7 @@ class WorkflowDatabase:
 
         # Get paginated results
         query = f"""
-            SELECT * FROM workflows 
+            SELECT {_LIST_COLUMNS_SQL} FROM workflows
             WHERE {where_clause}
             ORDER BY analyzed_at DESC
             LIMIT {limit} OFFSET {offset}
@@ -963,13 +1157,11 @@ class WorkflowDatabase:
             
             results.append(workflow)
 
-        conn.close()
         return results, total
 
     def delete_workflow(self, filename: str) -> bool:
         """Delete a workflow from the database by filename."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        conn = self._get_connection()
         
         try:
             # Check if workflow exists
@@ -978,24 +1170,21 @@ class WorkflowDatabase:
                 (filename,)
             )
             row = cursor.fetchone()
-            
+
             if not row:
-                conn.close()
                 return False
-            
+
             # Delete from workflows table (FTS table will be updated by trigger)
             conn.execute(
                 "DELETE FROM workflows WHERE filename = ?",
                 (filename,)
             )
-            
+
             conn.commit()
-            conn.close()
             return True
-            
+
         except Exception as e:
             print(f"Error deleting workflow {filename} from database: {e}")
-            conn.close()
             return False
 
 